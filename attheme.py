@@ -0,0 +1,204 @@
+# Streaming reader/writer for .attheme/.atthex files
+# The input is memory-mapped and key lines are decoded one at a time. The
+# wallpaper section (WPS ... WPE) that some themes carry after the keys is
+# handed out as a memoryview into the map and never decoded.
+
+import os
+import re
+import glob
+import mmap
+
+RE_LINE = re.compile(r'^(\w+)=(.+)$')
+WPS = b'WPS\n'
+WPE = b'\nWPE'
+EXTENSIONS = ('.attheme', '.atthex')
+
+
+def split_wallpaper(buf):
+    # Returns where the key lines end and the (start, end) of the wallpaper
+    if buf[:len(WPS)] == WPS:
+        keys_end = 0
+    else:
+        keys_end = buf.find(b'\n' + WPS)
+        if keys_end == -1:
+            return len(buf), None
+        keys_end += 1
+
+    start = keys_end + len(WPS)
+    end = buf.rfind(WPE, start)
+    if end == -1:
+        end = len(buf)
+    return keys_end, (start, end)
+
+
+class reader:
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.map = None
+        self.buf = None
+        self.keys_end = 0
+        self.wallpaper = None
+
+    def __enter__(self):
+        self.file = open(self.path, 'rb')
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files can't be mapped
+            self.map = None
+        self.buf = memoryview(self.map if self.map is not None else b'')
+        self.keys_end, wallpaper = split_wallpaper(self.map or b'')
+        if wallpaper is not None:
+            self.wallpaper = self.buf[wallpaper[0]:wallpaper[1]]
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        # views have to be released before the map can be closed
+        if self.wallpaper is not None:
+            self.wallpaper.release()
+            self.wallpaper = None
+        if self.buf is not None:
+            self.buf.release()
+            self.buf = None
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def lines(self):
+        pos, end = 0, self.keys_end
+        lineno = 0
+        while pos < end:
+            nl = self.map.find(b'\n', pos, end)
+            if nl == -1:
+                nl = end
+            lineno += 1
+            yield lineno, bytes(self.buf[pos:nl]).decode().strip()
+            pos = nl + 1
+
+    def records(self):
+        # (lineno, key, value), key is None for lines that aren't key=value
+        for lineno, line in self.lines():
+            match = RE_LINE.match(line)
+            if match:
+                yield lineno, match.group(1), match.group(2)
+            else:
+                yield lineno, None, line
+
+    def keys(self):
+        for _, key, _ in self.records():
+            if key is not None:
+                yield key
+
+
+def parse_value(value):
+    # unsigned ARGB of an .attheme (signed int) or .atthex (#hex) value
+    if value.startswith('#'):
+        return int(value[1:], 16) & 0xFFFFFFFF
+    return int(value) & 0xFFFFFFFF
+
+
+def load_values(path):
+    # key -> unsigned ARGB, for analysis tools that want the whole table
+    values = {}
+    with reader(path) as f:
+        for _, key, value in f.records():
+            if key is not None:
+                values[key] = parse_value(value)
+    return values
+
+
+class stream_reader:
+    # Same records as reader, but from a binary stream such as stdin. Reading
+    # stops at the WPS line; wallpaper_chunks() then yields the rest of the
+    # stream untouched (WPE trailer included).
+    def __init__(self, file, chunk_size=1 << 16):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.has_wallpaper = False
+
+    def lines(self):
+        for lineno, line in enumerate(self.file, 1):
+            if line == WPS:
+                self.has_wallpaper = True
+                return
+            yield lineno, line.decode().strip()
+
+    records = reader.records
+    keys = reader.keys
+
+    def wallpaper_chunks(self):
+        while True:
+            chunk = self.file.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+class writer:
+    # Writes to a temporary file next to path and moves it into place on a
+    # clean exit, so readers never see a half written theme. Pass file to
+    # write to an already open binary stream instead.
+    def __init__(self, path=None, file=None):
+        self.path = path
+        self.file = file
+        self.tmp = None
+        self.first = True
+
+    def __enter__(self):
+        if self.file is None:
+            self.tmp = f'{self.path}.{os.getpid()}.tmp'
+            self.file = open(self.tmp, 'wb')
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if self.tmp is None:
+            self.file.flush()
+            return
+        self.file.close()
+        if exc_type is None:
+            os.replace(self.tmp, self.path)
+        else:
+            os.unlink(self.tmp)
+
+    def write_line(self, line):
+        if not self.first:
+            self.file.write(b'\n')
+        self.first = False
+        self.file.write(line.encode())
+
+    def write(self, key, value):
+        self.write_line(f'{key}={value}')
+
+    def write_wallpaper(self, blob):
+        self.file.write(b'\n' + WPS)
+        self.file.write(blob)
+        self.file.write(WPE + b'\n')
+
+    def write_raw_wallpaper(self, chunks):
+        # chunks already carry their own WPE trailer
+        self.file.write(b'\n' + WPS)
+        for chunk in chunks:
+            self.file.write(chunk)
+
+
+def expand_paths(patterns, extensions=EXTENSIONS):
+    # Files are passed through, directories are walked for theme files and
+    # globs are expanded (for shells that don't, or patterns read from stdin)
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, dirs, files in os.walk(pattern):
+                dirs.sort()
+                for name in sorted(files):
+                    if os.path.splitext(name)[1] in extensions:
+                        yield os.path.join(root, name)
+        elif glob.has_magic(pattern):
+            yield from sorted(glob.glob(pattern, recursive=True))
+        else:
+            yield pattern
@@ -0,0 +1,182 @@
+# Benchmarks for the hot paths: build.py render, conv.py and keyinfo.py
+# Usage: python bench.py [-s 10000,100000,1000000] [-n repeat] [-o bench.json] [-c old.json]
+# Every case runs on true_black.attheme and on synthetic themes of the given
+# sizes, with and without an embedded wallpaper. Timings are the best of
+# -n runs, in seconds. With -c, cases that got slower than the tolerance
+# compared to an earlier result file are listed and the exit status is 1.
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import subprocess
+import tempfile
+
+import conv
+import keyinfo
+from build import BuildContext, build_theme, theme_spec, true_black, to_signed_32bit
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+WALLPAPER_SIZE = 1 << 20
+DEFAULT_TOLERANCE = 0.2
+
+
+def best_of(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def synthetic_theme(path, size, wallpaper=False, offset=0, seed=0):
+    rng = random.Random(seed)
+    with open(path, 'w') as f:
+        f.write('\n'.join(
+            f'key{i + offset}={to_signed_32bit(rng.getrandbits(32))}'
+            for i in range(size)
+        ))
+    if wallpaper:
+        with open(path, 'ab') as f:
+            f.write(b'\nWPS\n')
+            f.write(rng.randbytes(WALLPAPER_SIZE))
+            f.write(b'\nWPE\n')
+
+
+def synthetic_spec(size):
+    # The real palette with its key expressions repeated up to size keys
+    exprs = list(true_black.keys.values())
+    return theme_spec(true_black.palette, {f'key{i}': exprs[i % len(exprs)] for i in range(size)})
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_build(results, sizes, repeat):
+    results['build/true_black'] = best_of(lambda: build_theme(true_black), repeat)
+    try:
+        import debugcolours
+    except ImportError:
+        debugcolours = None
+    if debugcolours is not None:
+        debug = debugcolours.assign(true_black.keys)
+        results['build/true_black -d'] = best_of(
+            lambda: build_theme(true_black, BuildContext(gen_debug=True, debug_colours=debug)), repeat)
+    for size in sizes:
+        spec = synthetic_spec(size)
+        results[f'build/{size}'] = best_of(lambda: build_theme(spec), repeat)
+
+
+def bench_file(results, name, path, tmp, repeat, bulk):
+    atthex = os.path.join(tmp, 'out.atthex')
+    attheme = os.path.join(tmp, 'out.attheme')
+    log = lambda msg: None
+    results[f'conv/to_hex/{name}'] = best_of(
+        lambda: conv.do_thing(path, atthex, conv.int_to_hex, log), repeat)
+    results[f'conv/from_hex/{name}'] = best_of(
+        lambda: conv.do_thing(atthex, attheme, conv.hex_to_int, log), repeat)
+    if bulk is not None:
+        results[f'conv_bulk/to_hex/{name}'] = best_of(
+            lambda: bulk.convert(path, atthex, True, log), repeat)
+        results[f'conv_bulk/from_hex/{name}'] = best_of(
+            lambda: bulk.convert(atthex, attheme, False, log), repeat)
+
+
+def bench_keyinfo(results, name, ours, theirs, repeat):
+    def diff():
+        a = keyinfo.get_keys(ours)
+        b = keyinfo.get_keys(theirs)
+        return a - b, b - a
+    results[f'keyinfo/{name}'] = best_of(diff, repeat)
+
+
+def run(sizes, repeat):
+    try:
+        import bulkconv
+    except ImportError:
+        bulkconv = None
+
+    results = {}
+    bench_build(results, sizes, repeat)
+    with tempfile.TemporaryDirectory() as tmp:
+        bench_file(results, 'true_black', 'true_black.attheme', tmp, repeat, bulkconv)
+        bench_keyinfo(results, 'true_black', 'true_black.attheme', 'true_black.attheme', repeat)
+        for size in sizes:
+            for wallpaper in (False, True):
+                name = f'{size}+wp' if wallpaper else str(size)
+                ours = os.path.join(tmp, f'ours_{name}.attheme')
+                theirs = os.path.join(tmp, f'theirs_{name}.attheme')
+                synthetic_theme(ours, size, wallpaper)
+                # half of the keys overlap with ours
+                synthetic_theme(theirs, size, wallpaper, offset=size // 2, seed=1)
+                bench_file(results, name, ours, tmp, repeat, bulkconv)
+                bench_keyinfo(results, name, ours, theirs, repeat)
+    return results
+
+
+def compare(old, new, tolerance):
+    regressions = []
+    for name, seconds in new.items():
+        before = old.get(name)
+        if before is None:
+            continue
+        ratio = seconds / before if before else float('inf')
+        flag = ''
+        if ratio > 1 + tolerance:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        print(f'{name:40} {before:10.4f}s -> {seconds:10.4f}s  x{ratio:.2f}{flag}')
+    return regressions
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog=argv[0])
+    parser.add_argument('-s', '--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='comma separated synthetic theme sizes, in keys')
+    parser.add_argument('-n', '--repeat', type=int, default=3)
+    parser.add_argument('-o', '--output', default='bench.json')
+    parser.add_argument('-c', '--compare', help='earlier result file to compare against')
+    parser.add_argument('-t', '--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='allowed slowdown before a case counts as a regression')
+    args = parser.parse_args(argv[1:])
+
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    results = run(sizes, args.repeat)
+    report = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'repeat': args.repeat,
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=1)
+
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        print(f'{old.get("revision")} -> {report["revision"]}')
+        regressions = compare(old['results'], results, args.tolerance)
+        print(f'{len(regressions)} regression(s)')
+        return 1 if regressions else 0
+
+    for name, seconds in results.items():
+        print(f'{name:40} {seconds:10.4f}s')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -1,8 +1,18 @@
+import os
+import re
 import sys
-import random
+import ast
+import json
+import time
+import argparse
 import colorsys
-from uuid import uuid4
-from collections import Counter, defaultdict
+from array import array
+from collections import Counter, defaultdict, namedtuple
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+from cache import build_cache, spec_digest, write_if_changed
+from colourindex import clusters
 
 
 def to_signed_32bit(n):
@@ -26,6 +36,39 @@ def hex_to_tuple(hex_str):
     return (r, g, b, a)
 
 
+def pack_argb(r, g, b, a):
+    return (a << 24) | (r << 16) | (g << 8) | b
+
+
+def to_argb(r, g=None, b=None, a=None):
+    # convert hex to tuple
+    if isinstance(r, str):
+        r, g, b, a = hex_to_tuple(r)
+
+    # figure out alpha from type
+    if a is None:
+        a = 1.0 if isinstance(r, float) else 255
+
+    types = tuple(type(v) for v in (r, g, b, a))
+    if not all(t == types[0] for t in types):
+        raise TypeError(
+            f'(r, g, b) should all be of the same type but got {types}'
+        )
+
+    if not isinstance(r, (int, float)):
+        raise TypeError(f'Expected ints or floats but got {type(r)}')
+
+    # convert float (0-1) to int (0-255)
+    if isinstance(r, float):
+        r, g, b, a = (round(c * 255) for c in (r, g, b, a))
+
+    return pack_argb(r, g, b, a)
+
+
+def unpack_rgb(rgb):
+    return ((rgb >> 16) & 0xFF, (rgb >> 8) & 0xFF, rgb & 0xFF)
+
+
 def sorted_items(dict, key=None, reverse=False):
     if key is None:
         key = lambda k, v: v
@@ -34,58 +77,248 @@ def sorted_items(dict, key=None, reverse=False):
         yield k, dict[k]
 
 
-def get_debug_colour():
-    h = random.uniform(0, 1)
-    s = random.uniform(0.3, 1)
-    v = random.uniform(0.3, 1)
-    r, g, b = [round(i * 255) for i in colorsys.hsv_to_rgb(h, s, v)]
-    return ''.join(f'{c:02X}' for c in (255, r, g, b))
+class colour_table:
+    # Each distinct ARGB value is stored once; rgba handles only keep its
+    # index. The signed decimal form written to the .attheme is computed
+    # on insertion so rendering a key is a list lookup.
+    __slots__ = ('index', 'argb', 'signed')
 
+    def __init__(self):
+        self.index = {}
+        self.argb = array('L')
+        self.signed = []
 
-class rgba:
-    colour_usage_counter = Counter()
-    colour_instances = defaultdict(set)
-    never_used = set()
-    gen_debug = False
-    usage_counter = 0
-
-    def __init__(self, r, g=None, b=None, a=None, has_parent=False):
-        # convert hex to tuple
-        if isinstance(r, str):
-            r, g, b, a = hex_to_tuple(r)
-
-        # figure out alpha from type
-        if a is None:
-            a = 1.0 if isinstance(r, float) else 255
-
-        types = tuple(type(v) for v in (r, g, b, a))
-        if not all(t == types[0] for t in types):
-            raise TypeError(
-                f'(r, g, b) should all be of the same type but got {types}'
+    def intern(self, argb):
+        i = self.index.get(argb)
+        if i is None:
+            i = self.index[argb] = len(self.argb)
+            self.argb.append(argb)
+            self.signed.append(str(to_signed_32bit(argb)))
+        return i
+
+    def __len__(self):
+        return len(self.argb)
+
+
+# True Black's main accent, the blue used for links, reply lines etc.
+BASE_ACCENT = (81, 154, 186)
+# Hue band (in turns) and minimum saturation of the accent family
+ACCENT_HUES = (195 / 360, 225 / 360)
+ACCENT_MIN_SAT = 0.2
+# Greys up to black_45 form the darkness ramp
+RAMP_TOP = 115
+# Used colours closer than this are reported as near duplicates, per colour
+# space ('rgb' is plain byte distance, the others are deltaE in colourspace)
+NEAR_THRESHOLDS = {'rgb': 10, 'oklab': 0.02, 'lab': 2.3}
+
+
+def rgb_to_hsv(rgb):
+    return colorsys.rgb_to_hsv(*(c / 255 for c in rgb))
+
+
+class variant:
+    # Recolours a theme: the accent family is rotated onto `accent` and the
+    # grey ramp is lifted so that black becomes `darkness`. This is a pure
+    # function of a colour's RGB, so alpha-derived colours follow their
+    # parent and an already rendered theme can be remapped value by value.
+    __slots__ = ('accent', 'darkness', 'shift')
+
+    def __init__(self, accent=None, darkness=0):
+        if not 0 <= darkness < RAMP_TOP:
+            raise ValueError(f'darkness should be in [0, {RAMP_TOP}) but got {darkness}')
+        self.accent = accent
+        self.darkness = darkness
+        self.shift = None
+        if accent is not None:
+            bh, bs, bv = rgb_to_hsv(BASE_ACCENT)
+            h, s, v = rgb_to_hsv(accent[:3])
+            self.shift = (h - bh, s / bs, v / bv)
+
+    @property
+    def name(self):
+        accent = 'base' if self.accent is None else ''.join(f'{c:02x}' for c in self.accent[:3])
+        return f'{accent}_{self.darkness}'
+
+    def is_static(self, argb):
+        r, g, b = unpack_rgb(argb)
+        if r == g == b:
+            return r > RAMP_TOP
+        h, s, _ = rgb_to_hsv((r, g, b))
+        return not (ACCENT_HUES[0] <= h <= ACCENT_HUES[1] and s >= ACCENT_MIN_SAT)
+
+    def __call__(self, argb):
+        if self.is_static(argb):
+            return argb
+        r, g, b = unpack_rgb(argb)
+        if r == g == b:
+            d = self.darkness
+            r = g = b = round(d + r * (RAMP_TOP - d) / RAMP_TOP)
+        elif self.shift is not None:
+            dh, ds, dv = self.shift
+            h, s, v = rgb_to_hsv((r, g, b))
+            r, g, b = (
+                round(c * 255) for c in
+                colorsys.hsv_to_rgb((h + dh) % 1, min(s * ds, 1), min(v * dv, 1))
+            )
+        return (argb & 0xFF000000) | pack_argb(r, g, b, 0)
+
+
+def print_warnings(warnings):
+    num_warnings = 0
+    for warning in warnings:
+        num_warnings += 1
+        print(f'Warning: {warning}')
+    print(f'{num_warnings} warning(s)')
+
+
+class build_stats:
+    # Wall clock time per build phase, summed when a phase runs more than once
+    def __init__(self):
+        self.timings = {}
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0) + time.perf_counter() - start
+
+
+def peak_memory():
+    # (traced peak in bytes if tracemalloc is running, peak RSS in KiB if the
+    # platform has the resource module)
+    import tracemalloc
+    traced = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+    try:
+        import resource
+    except ImportError:
+        rss = None
+    else:
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return traced, rss
+
+
+class BuildContext:
+    # Everything a single build mutates lives here so that several themes can
+    # be rendered side by side (threads or processes) with separate reports.
+    def __init__(self, gen_debug=False, variant=None, near_threshold=None, near_space='rgb',
+                 composite=False, debug_colours=None):
+        if gen_debug and debug_colours is None:
+            raise ValueError('gen_debug needs a debug_colours table (see debugcolours.py)')
+        self.variant = variant
+        # key -> ARGB rendered instead of the real colour (see debugcolours.py)
+        self.debug_colours = debug_colours
+        self.composite = composite
+        # the last plan compiled with this context, for whole-theme checks
+        self.plan = None
+        if near_threshold is None:
+            near_threshold = NEAR_THRESHOLDS[near_space]
+        self.near_threshold = near_threshold
+        self.near_space = near_space
+        self.colour_usage_counter = Counter()
+        self.colour_instances = defaultdict(set)
+        self.never_used = set()
+        self.gen_debug = gen_debug
+        self.usage_counter = 0
+        self.table = colour_table()
+        self.allocations = 0
+        self.alpha_derived = 0
+        self.stats = build_stats()
+
+    def rgba(self, r, g=None, b=None, a=None, has_parent=False):
+        return rgba(self, r, g, b, a, has_parent)
+
+    def warnings(self):
+        for colour in self.never_used:
+            yield f'{repr(colour)} is never used!'
+
+        for colour, count in sorted_items(self.colour_usage_counter):
+            if count >= 3:
+                continue
+            yield f'rgba{unpack_rgb(colour)} is only used {count} time(s)!'
+
+        for colour, ids in sorted_items(self.colour_instances, key=lambda k, v: len(v)):
+            if len(ids) <= 1:
+                continue
+            yield f'rgba{unpack_rgb(colour)} is defined by {len(ids)} instances!'
+
+        if self.near_threshold:
+            yield from self.near_duplicate_warnings()
+
+        if self.composite and self.plan is not None:
+            import composite
+            yield from composite.collisions(dict(zip(self.plan.keys, self.plan.values())))
+
+    def near_duplicate_warnings(self):
+        colours = sorted(self.colour_usage_counter)
+        if self.near_space == 'rgb':
+            points = [unpack_rgb(c) for c in colours]
+        else:
+            import colourspace
+            points = colourspace.convert(colours, self.near_space).tolist()
+        for group in clusters(points, self.near_threshold):
+            group = sorted((colours[i] for i in group), key=self.colour_usage_counter.get, reverse=True)
+            others = ', '.join(f'rgba{unpack_rgb(c)}' for c in group[1:])
+            yield (
+                f'rgba{unpack_rgb(group[0])} has near duplicates within '
+                f'{self.near_threshold} ({self.near_space}): {others}'
             )
 
-        if not isinstance(r, (int, float)):
-            raise TypeError(f'Expected ints or floats but got {type(r)}')
+    def print_warnings(self):
+        print_warnings(self.warnings())
 
-        # convert float (0-1) to int (0-255)
-        if isinstance(r, float):
-            r, g, b, a = (round(c * 255) for c in (r, g, b, a))
+    def report(self):
+        traced, rss = peak_memory()
+        return {
+            'timings': dict(self.stats.timings),
+            'rgba_allocations': self.allocations,
+            'interned_colours': len(self.table),
+            'alpha_derived_colours': self.alpha_derived,
+            'keys_rendered': self.usage_counter,
+            'peak_traced_bytes': traced,
+            'peak_rss_kib': rss,
+        }
 
-        self.r = r
-        self.g = g
-        self.b = b
-        self.a = a
+
+class rgba:
+    __slots__ = ('ctx', 'argb', 'ref', 'has_parent', 'id')
+
+    def __init__(self, ctx, r, g=None, b=None, a=None, has_parent=False):
+        self.ctx = ctx
+        self.argb = to_argb(r, g, b, a)
+        if ctx.variant is not None and not has_parent:
+            self.argb = ctx.variant(self.argb)
+        self.ref = ctx.table.intern(self.argb)
         self.has_parent = has_parent
-        self.uuid = uuid4()
+        self.id = ctx.allocations
+        ctx.allocations += 1
+
+        ctx.never_used.add(self)
 
-        rgba.never_used.add(self)
+    @property
+    def r(s):
+        return (s.argb >> 16) & 0xFF
+
+    @property
+    def g(s):
+        return (s.argb >> 8) & 0xFF
+
+    @property
+    def b(s):
+        return s.argb & 0xFF
+
+    @property
+    def a(s):
+        return s.argb >> 24
 
     def with_alpha(s, a):
-        rgba.never_used.discard(s)
-        return rgba(s.r, s.g, s.b, a, has_parent=True)
+        s.ctx.never_used.discard(s)
+        s.ctx.alpha_derived += 1
+        return rgba(s.ctx, s.r, s.g, s.b, a, has_parent=True)
 
     def as_argbhex(s):
-        return ''.join(f'{c:02X}' for c in (s.a, s.r, s.g, s.b))
+        return f'{s.argb:08X}'
 
     def as_rgbahex(s):
         return ''.join(f'{c:02X}' for c in (s.r, s.g, s.b, s.a))
@@ -94,9 +327,13 @@ class rgba:
         return (s.r, s.g, s.b, s.a)
 
     def as_rgb_tuple(s):
-        return (s.r, s.g, s.b)
+        return unpack_rgb(s.argb)
 
-    def dist(s, o):
+    def dist(s, o, space=None):
+        # space='oklab' or 'lab' gives perceptual deltaE (ignoring alpha)
+        if space is not None:
+            import colourspace
+            return float(colourspace.delta_e([s.argb], [o.argb], space)[0])
         v = (s.r - o.r)**2
         v += (s.g - o.g)**2
         v += (s.b - o.b)**2
@@ -104,59 +341,224 @@ class rgba:
         return v ** 0.5
 
     def __hash__(s):
-        return hash(s.as_tuple())
+        return hash(s.argb)
 
     def __eq__(s, o):
-        return s.as_tuple() == o.as_tuple()
+        return s.argb == o.argb
 
     def __repr__(s):
         return f'rgba({s.r}, {s.g}, {s.b}, {s.a})'
 
     def __str__(s):
-        rgba.usage_counter += 1
+        return s.use()
+
+    def use(s):
+        # the signed value written for a key, counted towards the warnings
+        ctx = s.ctx
+        ctx.usage_counter += 1
         # change range to selectively turn colours red for debugging
-        if rgba.usage_counter in range(0, 0):
+        if ctx.usage_counter in range(0, 0):
             return str(to_signed_32bit(0xFFFF0000))
-        if rgba.gen_debug:
-            return str(to_signed_32bit(int(get_debug_colour(), 16)))
-        rgba.colour_usage_counter.update((s.as_rgb_tuple(),))
-        rgba.never_used.discard(s)
+        rgb = s.argb & 0xFFFFFF
+        ctx.colour_usage_counter[rgb] += 1
+        ctx.never_used.discard(s)
         if not s.has_parent:
-            rgba.colour_instances[s.as_rgb_tuple()].add(s.uuid)
-        int_val = int(s.as_argbhex(), 16)
-        return f'{to_signed_32bit(int_val)}'
-
-    @staticmethod
-    def print_warnings():
-        num_warnings = 0
-        for colour in rgba.never_used:
-            num_warnings += 1
-            print(f'Warning: {repr(colour)} is never used!')
-
-        for colour, count in sorted_items(rgba.colour_usage_counter):
-            if count >= 3:
-                continue
-            num_warnings += 1
-            print(f'Warning: rgba{repr(colour)} is only used {count} time(s)!')
+            ctx.colour_instances[rgb].add(s.id)
+        return ctx.table.signed[s.ref]
 
-        for colour, ids in sorted_items(rgba.colour_instances, key=lambda k, v: len(v)):
-            if len(ids) <= 1:
-                continue
-            num_warnings += 1
-            print(f'Warning: rgba{repr(colour)} is defined by {len(ids)} instances!')
 
-        print(f'{num_warnings} warning(s)')
+RE_ENTRY = re.compile(r'^(\w+)\s*=\s*(.+)$')
+RE_EXPR = re.compile(
+    r'^(?:(?P<name>\w+)|rgba\((?P<args>[^)]*)\))'
+    r'(?:\.with_alpha\((?P<alpha>\d+)\))?$'
+)
 
 
-class placeholder:
+class colour_expr(namedtuple('colour_expr', ('base', 'alpha'))):
+    # base is either a palette name or the arguments of an rgba(...) literal
+    __slots__ = ()
+
+    @classmethod
+    def parse(cls, text):
+        match = RE_EXPR.match(text.strip())
+        if not match:
+            raise ValueError(f'Invalid colour expression {text!r}')
+        if match['name']:
+            base = match['name']
+        else:
+            base = ast.literal_eval(f'({match["args"]},)')
+        alpha = match['alpha']
+        return cls(base, None if alpha is None else int(alpha))
+
     def __str__(self):
-        h = random.uniform(0, 1)
-        s = random.uniform(0.3, 1)
-        v = random.uniform(0.3, 1)
-        rgb = colorsys.hsv_to_rgb(h, s, v)
-        return str(rgba(*rgb))
+        if isinstance(self.base, str):
+            text = self.base
+        else:
+            text = f'rgba({", ".join(repr(c) for c in self.base)})'
+        if self.alpha is not None:
+            text += f'.with_alpha({self.alpha})'
+        return text
+
 
+def parse_entries(text):
+    entries = {}
+    for i, line in enumerate(text.strip().split('\n'), 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        match = RE_ENTRY.match(line)
+        if not match:
+            raise ValueError(f'line {i}: expected name=colour but got {line!r}')
+        entries[match[1]] = colour_expr.parse(match[2])
+    return entries
 
+
+def format_spec(palette, keys, comment=None):
+    # A spec module (PALETTE and KEYS blocks) from name -> expression text
+    lines = []
+    if comment:
+        lines.append(f'# {comment}')
+    lines.append('from build import theme_spec')
+    lines.append('')
+    lines.append("PALETTE = '''")
+    lines.extend(f'{name} = {expr}' for name, expr in palette.items())
+    lines.append("'''")
+    lines.append('')
+    lines.append("KEYS = '''")
+    lines.extend(f'{key}={expr}' for key, expr in keys.items())
+    lines.append("'''")
+    lines.append('')
+    lines.append('spec = theme_spec.from_text(PALETTE, KEYS)')
+    return '\n'.join(lines) + '\n'
+
+
+class theme_spec:
+    # palette: name -> colour_expr, may refer to earlier palette entries
+    # keys: theme key -> colour_expr, in output order
+    def __init__(self, palette, keys):
+        self.palette = palette
+        self.keys = keys
+        self._resolved = None
+
+    @classmethod
+    def from_text(cls, palette, keys):
+        return cls(parse_entries(palette), parse_entries(keys))
+
+    @classmethod
+    def from_source(cls, source):
+        # inverse of source()
+        palette, keys = source.split('\n\n', 1)
+        return cls.from_text(palette, keys)
+
+    def source(self):
+        palette = '\n'.join(f'{name} = {e}' for name, e in self.palette.items())
+        keys = '\n'.join(f'{key}={e}' for key, e in self.keys.items())
+        return f'{palette}\n\n{keys}'
+
+    def resolve(self, e):
+        # ARGB value of an expression, ignoring any variant
+        if isinstance(e.base, str):
+            if self._resolved is None:
+                self._resolved = {}
+                for name, p in self.palette.items():
+                    self._resolved[name] = self.resolve(p)
+            try:
+                argb = self._resolved[e.base]
+            except KeyError:
+                raise NameError(f'{e.base} is not in the palette') from None
+        else:
+            argb = to_argb(*e.base)
+        if e.alpha is not None:
+            argb = (argb & 0xFFFFFF) | (e.alpha << 24)
+        return argb
+
+    def resolved_keys(self):
+        return {key: self.resolve(e) for key, e in self.keys.items()}
+
+    def diff(self, other):
+        # keys removed, added and changed (by resolved colour) going to other
+        ours = self.resolved_keys()
+        theirs = other.resolved_keys()
+        removed = [k for k in ours if k not in theirs]
+        added = [k for k in theirs if k not in ours]
+        changed = [k for k, v in theirs.items() if k in ours and ours[k] != v]
+        return removed, added, changed
+
+    def compile(self, ctx):
+        handles = {}
+
+        def resolve(e):
+            if isinstance(e.base, str):
+                try:
+                    h = handles[e.base]
+                except KeyError:
+                    raise NameError(f'{e.base} is not in the palette') from None
+            else:
+                h = ctx.rgba(*e.base)
+            if e.alpha is not None:
+                h = h.with_alpha(e.alpha)
+            return h
+
+        for name, e in self.palette.items():
+            handles[name] = resolve(e)
+        ctx.plan = render_plan(ctx, list(self.keys), [resolve(e) for e in self.keys.values()])
+        return ctx.plan
+
+
+class render_plan:
+    # Flat form of a compiled spec: key i is rendered from handles[i], whose
+    # colour sits at refs[i] in the context's colour table.
+    __slots__ = ('ctx', 'keys', 'handles', 'refs', 'index')
+
+    def __init__(self, ctx, keys, handles):
+        self.ctx = ctx
+        self.keys = keys
+        self.handles = handles
+        self.refs = array('I', (h.ref for h in handles))
+        self.index = {key: i for i, key in enumerate(keys)}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def values(self):
+        argb = self.ctx.table.argb
+        return array('L', (argb[r] for r in self.refs))
+
+    def render(self, only=None):
+        # every key, or just the keys in only; either way each rendered key
+        # is counted once towards the warnings
+        keys, handles = self.keys, self.handles
+        if only is None:
+            ids = range(len(keys))
+        else:
+            ids = [self.index[key] for key in only]
+        debug = self.ctx.debug_colours
+        if debug is not None:
+            lines = [f'{keys[i]}={to_signed_32bit(debug[keys[i]])}' for i in ids]
+            self.ctx.usage_counter += len(lines)
+            return '\n'.join(lines)
+        return '\n'.join(f'{keys[i]}={handles[i]}' for i in ids)
+
+    def patch(self, lines, only):
+        # Updates lines, an earlier render of the same keys, re-rendering only
+        # the keys in only. Every key is still counted, in order, so the
+        # warnings come out the same as after a full render.
+        only = set(only)
+        keys, handles = self.keys, self.handles
+        debug = self.ctx.debug_colours
+        if debug is not None:
+            for key in only:
+                lines[self.index[key]] = f'{key}={to_signed_32bit(debug[key])}'
+            self.ctx.usage_counter += len(keys)
+            return lines
+        for i, key in enumerate(keys):
+            value = handles[i].use()
+            if key in only:
+                lines[i] = f'{key}={value}'
+        return lines
+
+
+TRUE_BLACK_PALETTE = '''
 black = rgba(0, 0, 0)
 black_10 = rgba(26, 26, 26)
 black_15 = rgba(38, 38, 38)
@@ -173,650 +575,917 @@ white = rgba(255, 255, 255)
 
 transparent = black.with_alpha(0)
 
+light_red = rgba(238, 104, 111)
+
 placeholder_red = rgba(255, 0, 0)
 placeholder_green = rgba(0, 255, 0)
 placeholder_cyan = rgba(0, 255, 255)
 placeholder_yellow = rgba(255, 255, 0)
+'''
+
+TRUE_BLACK_KEYS = '''
+actionBarActionModeDefault=black
+actionBarActionModeDefaultIcon=white_90
+actionBarActionModeDefaultSelector=black_20
+actionBarActionModeDefaultTop=black_10
+actionBarDefault=black
+actionBarDefaultArchived=black
+actionBarDefaultArchivedIcon=white
+actionBarDefaultArchivedSelector=black_20
+actionBarDefaultArchivedTitle=white
+actionBarDefaultIcon=white
+actionBarDefaultSearch=white
+actionBarDefaultSearchPlaceholder=white.with_alpha(128)
+actionBarDefaultSelector=black_40
+actionBarDefaultSubmenuBackground=black_10
+actionBarDefaultSubmenuItem=white_90
+actionBarDefaultSubmenuItemIcon=white_90
+actionBarDefaultSubtitle=white_60
+actionBarDefaultTitle=white
+actionBarTabActiveText=white
+actionBarTabLine=white
+actionBarTabSelector=white_60
+actionBarTabUnactiveText=white_60
+actionBarWhiteSelector=black.with_alpha(47)
+avatar_actionBarIconBlue=white
+avatar_actionBarIconCyan=white
+avatar_actionBarIconGreen=white
+avatar_actionBarIconOrange=white
+avatar_actionBarIconPink=white
+avatar_actionBarIconRed=white
+avatar_actionBarIconViolet=white
+avatar_actionBarSelectorBlue=black
+avatar_actionBarSelectorCyan=white_60
+avatar_actionBarSelectorGreen=white_60
+avatar_actionBarSelectorOrange=white_60
+avatar_actionBarSelectorPink=white_60
+avatar_actionBarSelectorRed=white_60
+avatar_actionBarSelectorViolet=white_60
+avatar_backgroundActionBarBlue=black_10
+avatar_backgroundActionBarCyan=black_10
+avatar_backgroundActionBarGreen=black_10
+avatar_backgroundActionBarOrange=black_10
+avatar_backgroundActionBarPink=black_10
+avatar_backgroundActionBarRed=black_10
+avatar_backgroundActionBarViolet=black_10
+avatar_backgroundArchived=black_30
+avatar_backgroundArchivedHidden=black_10
+avatar_backgroundBlue=rgba(86, 163, 219)
+avatar_backgroundCyan=rgba(95, 190, 213)
+avatar_backgroundGreen=rgba(118, 200, 77)
+avatar_backgroundGroupCreateSpanBlue=black
+avatar_backgroundInProfileBlue=black
+avatar_backgroundOrange=rgba(242, 140, 72)
+avatar_backgroundPink=rgba(242, 116, 154)
+avatar_backgroundRed=rgba(229, 101, 85)
+avatar_backgroundSaved=rgba(102, 191, 250)
+avatar_backgroundViolet=rgba(142, 133, 238)
+avatar_nameInMessageBlue=rgba(78, 146, 204)
+avatar_nameInMessageCyan=rgba(66, 177, 168)
+avatar_nameInMessageGreen=rgba(103, 179, 93)
+avatar_nameInMessageOrange=rgba(220, 136, 89)
+avatar_nameInMessagePink=rgba(78, 146, 204)
+avatar_nameInMessageRed=rgba(205, 90, 90)
+avatar_nameInMessageViolet=rgba(78, 146, 204)
+avatar_subtitleInProfileBlue=white_80
+avatar_subtitleInProfileCyan=white_80
+avatar_subtitleInProfileGreen=white_80
+avatar_subtitleInProfileOrange=white_80
+avatar_subtitleInProfilePink=white_80
+avatar_subtitleInProfileRed=white_80
+avatar_subtitleInProfileViolet=white_80
+avatar_text=white_90
+calls_callReceivedGreenIcon=rgba(0, 200, 83)
+calls_callReceivedRedIcon=rgba(255, 72, 72)
+changephoneinfo_image=white_70
+chat_addContact=rgba(86, 163, 219)
+chat_adminSelectedText=white_60
+chat_adminText=white_60
+chat_attachActiveTab=rgba(106, 191, 255, 255)
+chat_attachAudioBackground=rgba(242, 140, 72)
+chat_attachAudioIcon=white
+chat_attachCameraIcon1=rgba(255, 125, 48)
+chat_attachContactBackground=rgba(222, 176, 69, 255)
+chat_attachContactIcon=white
+chat_attachFileBackground=rgba(90, 188, 244, 255)
+chat_attachFileIcon=white
+chat_attachGalleryBackground=rgba(77, 150, 245, 255)
+chat_attachGalleryIcon=white
+chat_attachHideBackground=white_70
+chat_attachLocationIcon=white
+chat_attachPollBackground=rgba(222, 176, 69, 255)
+chat_attachSendBackground=rgba(62, 193, 249)
+chat_attachUnactiveTab=rgba(109, 145, 166, 255)
+chat_botButtonText=white
+chat_botKeyboardButtonBackground=black_10
+chat_botKeyboardButtonBackgroundPressed=black_20
+chat_botKeyboardButtonText=white
+chat_botProgress=white
+chat_botSwitchToInlineText=rgba(58, 140, 207)
+chat_editDoneIcon=rgba(81, 189, 243)
+chat_emojiBottomPanelIcon=black_40
+chat_emojiPanelBackground=black
+chat_emojiPanelBackspace=black_40
+chat_emojiPanelBadgeBackground=rgba(77, 166, 234)
+chat_emojiPanelBadgeText=white
+chat_emojiPanelEmptyText=black_40
+chat_emojiPanelIcon=black_40
+chat_emojiPanelIconSelected=white
+chat_emojiPanelIconSelector=white
+chat_emojiPanelMasksIcon=white
+chat_emojiPanelMasksIconSelected=rgba(98, 191, 232)
+chat_emojiPanelNewTrending=rgba(77, 166, 234)
+chat_emojiPanelShadowLine=black_30
+chat_emojiPanelStickerPackSelector=black_10
+chat_emojiPanelStickerPackSelectorLine=rgba(100, 181, 239, 255)
+chat_emojiPanelStickerSetName=white_60
+chat_emojiPanelStickerSetNameIcon=white_70
+chat_emojiPanelTrendingDescription=black_40
+chat_emojiPanelTrendingTitle=white_60
+chat_emojiSearchBackground=black_10
+chat_emojiSearchIcon=black_45
+chat_fieldOverlayText=rgba(58, 140, 207)
+chat_gifSaveHintBackground=rgba(17, 17, 17, 204)
+chat_gifSaveHintText=white
+chat_goDownButton=black_30
+chat_goDownButtonCounter=white
+chat_goDownButtonCounterBackground=rgba(77, 166, 234)
+chat_goDownButtonIcon=white_80
+chat_goDownButtonShadow=black
+chat_inAudioCacheSeekbar=gray
+chat_inAudioDurationSelectedText=white_60
+chat_inAudioDurationText=white_60
+chat_inAudioPerfomerSelectedText=white_60
+chat_inAudioPerfomerText=white_60
+chat_inAudioProgress=black_20
+chat_inAudioSeekbar=black_10
+chat_inAudioSeekbarFill=rgba(114, 181, 232)
+chat_inAudioSeekbarSelected=black_40
+chat_inAudioSelectedProgress=black_20
+chat_inAudioTitleText=white_80
+chat_inBubble=black_10
+chat_inBubbleSelected=black_20
+chat_inBubbleShadow=transparent
+chat_inContactBackground=rgba(114, 181, 232)
+chat_inContactIcon=black_20
+chat_inContactNameText=rgba(81, 154, 186)
+chat_inContactPhoneSelectedText=black_20
+chat_inContactPhoneText=white_60
+chat_inFileBackground=white_60
+chat_inFileBackgroundSelected=white_60
+chat_inFileIcon=black_20
+chat_inFileInfoSelectedText=white_60
+chat_inFileInfoText=white_60
+chat_inFileNameText=white_80
+chat_inFileProgress=white_60
+chat_inFileProgressSelected=white_60
+chat_inFileSelectedIcon=black_20
+chat_inForwardedNameText=rgba(81, 154, 186)
+chat_inInstant=rgba(58, 140, 207)
+chat_inInstantSelected=rgba(48, 121, 181)
+chat_inlineResultIcon=rgba(78, 146, 204)
+chat_inLoader=black_20
+chat_inLoaderPhoto=black_20
+chat_inLoaderPhotoIcon=white_60
+chat_inLoaderPhotoIconSelected=white_80
+chat_inLoaderPhotoSelected=black_40
+chat_inLoaderSelected=black_40
+chat_inLocationBackground=white_80
+chat_inLocationIcon=black_20
+chat_inMediaIcon=white_80
+chat_inMediaIconSelected=white
+chat_inMenu=white_60
+chat_inMenuSelected=white_60
+chat_inPreviewInstantSelectedText=rgba(81, 154, 186)
+chat_inPreviewInstantText=rgba(81, 154, 186)
+chat_inPreviewLine=rgba(81, 154, 186)
+chat_inReplyLine=rgba(81, 154, 186)
+chat_inReplyMediaMessageSelectedText=white_60
+chat_inReplyMediaMessageText=white_60
+chat_inReplyMessageText=white_60
+chat_inReplyNameText=rgba(81, 154, 186)
+chat_inSentClock=white_80
+chat_inSentClockSelected=white_80
+chat_inSiteNameText=rgba(81, 154, 186)
+chat_inTextSelectionHighlight=rgba(78, 180, 243, 90)
+chat_inTimeSelectedText=white_60
+chat_inTimeText=white_60
+chat_inVenueInfoSelectedText=white_60
+chat_inVenueInfoText=rgba(93, 111, 128)
+chat_inViaBotNameText=rgba(91, 175, 211)
+chat_inViews=white_60
+chat_inViewsSelected=white_60
+chat_inVoiceSeekbar=white_60
+chat_inVoiceSeekbarFill=gray
+chat_inVoiceSeekbarSelected=white
+chat_linkSelectBackground=rgba(98, 169, 227, 51)
+chat_lockIcon=white
+chat_mediaBroadcast=white
+chat_mediaInfoText=white
+chat_mediaLoaderPhoto=black.with_alpha(102)
+chat_mediaLoaderPhotoIcon=white
+chat_mediaLoaderPhotoIconSelected=white_80
+chat_mediaLoaderPhotoSelected=black.with_alpha(128)
+chat_mediaMenu=black
+chat_mediaProgress=white
+chat_mediaSentCheck=white
+chat_mediaSentClock=white
+chat_mediaTimeBackground=black.with_alpha(102)
+chat_mediaTimeText=white
+chat_mediaViews=white
+chat_messageLinkIn=rgba(86, 163, 219)
+chat_messageLinkOut=rgba(86, 163, 219)
+chat_messagePanelBackground=black
+chat_messagePanelCancelInlineBot=white_70
+chat_messagePanelCursor=white_70
+chat_messagePanelHint=white_60.with_alpha(201)
+chat_messagePanelIcons=black_40
+chat_messagePanelSend=rgba(98, 176, 235)
+chat_messagePanelShadow=black
+chat_messagePanelText=white
+chat_messagePanelVoiceBackground=rgba(78, 146, 204)
+chat_messagePanelVoiceDelete=black_40
+chat_messagePanelVoiceDuration=white
+chat_messagePanelVoicePressed=white
+chat_messageTextIn=white
+chat_messageTextOut=white
+chat_muteIcon=white_80
+chat_outAudioCacheSeekbar=gray
+chat_outAudioDurationSelectedText=white_60
+chat_outAudioDurationText=white_60
+chat_outAudioPerfomerSelectedText=white_60
+chat_outAudioPerfomerText=white_60
+chat_outAudioProgress=black_20
+chat_outAudioSeekbar=black_30
+chat_outAudioSeekbarFill=gray
+chat_outAudioSeekbarSelected=gray
+chat_outAudioSelectedProgress=black_20
+chat_outAudioTitleText=white_80
+chat_outBroadcast=rgba(70, 170, 54)
+chat_outBubble=black_10
+chat_outBubbleSelected=black_20
+chat_outBubbleShadow=transparent
+chat_outContactBackground=white_80
+chat_outContactIcon=black_20
+chat_outContactNameText=rgba(81, 154, 186)
+chat_outContactPhoneSelectedText=rgba(148, 211, 246, 255)
+chat_outContactPhoneText=white_80
+chat_outFileBackground=white_60
+chat_outFileBackgroundSelected=white_60
+chat_outFileIcon=black_20
+chat_outFileInfoSelectedText=white_60
+chat_outFileInfoText=white_60
+chat_outFileNameText=white_80
+chat_outFileProgress=white_60
+chat_outFileProgressSelected=white_60
+chat_outFileSelectedIcon=black_20
+chat_outForwardedNameText=rgba(81, 154, 186)
+chat_outInstant=rgba(81, 154, 186)
+chat_outInstantSelected=rgba(81, 154, 186)
+chat_outLoader=black_20
+chat_outLoaderPhoto=black_20
+chat_outLoaderPhotoIcon=white_60
+chat_outLoaderPhotoIconSelected=white_80
+chat_outLoaderPhotoSelected=black_40
+chat_outLoaderSelected=black_40
+chat_outLocationBackground=white_80
+chat_outLocationIcon=black_20
+chat_outMediaIcon=white_80
+chat_outMediaIconSelected=white
+chat_outMenu=white_60
+chat_outMenuSelected=white_60
+chat_outPreviewInstantSelectedText=rgba(81, 154, 186)
+chat_outPreviewInstantText=rgba(81, 154, 186)
+chat_outPreviewLine=rgba(81, 154, 186)
+chat_outReplyLine=rgba(81, 154, 186)
+chat_outReplyMediaMessageSelectedText=white_60
+chat_outReplyMediaMessageText=white_60
+chat_outReplyMessageText=white_60
+chat_outReplyNameText=rgba(81, 154, 186)
+chat_outSentCheck=white
+chat_outSentCheckRead=white
+chat_outSentCheckReadSelected=white
+chat_outSentCheckSelected=white
+chat_outSentClock=white_80
+chat_outSentClockSelected=white_80
+chat_outSiteNameText=rgba(81, 154, 186)
+chat_outTextSelectionHighlight=rgba(126, 192, 237, 126)
+chat_outTimeSelectedText=white_60
+chat_outTimeText=white_60
+chat_outUpCall=white
+chat_outVenueInfoSelectedText=white_60
+chat_outVenueInfoText=white_60
+chat_outVenueNameText=white_80
+chat_outViaBotNameText=rgba(58, 140, 207)
+chat_outViews=white_60
+chat_outViewsSelected=white_60
+chat_outVoiceSeekbar=white_60
+chat_outVoiceSeekbarFill=gray
+chat_outVoiceSeekbarSelected=white
+chat_previewDurationText=white
+chat_previewGameText=white
+chat_recordedVoiceBackground=rgba(86, 163, 219)
+chat_recordedVoiceDot=rgba(218, 86, 77)
+chat_recordedVoicePlayPause=white
+chat_recordedVoicePlayPausePressed=rgba(217, 234, 251)
+chat_recordedVoiceProgress=rgba(162, 206, 248)
+chat_recordedVoiceProgressInner=white
+chat_recordTime=black_30
+chat_recordVoiceCancel=white_60
+chat_replyPanelClose=white_70
+chat_replyPanelIcons=rgba(77, 166, 234)
+chat_replyPanelLine=transparent
+chat_replyPanelMessage=white_80
+chat_replyPanelName=rgba(58, 140, 207)
+chat_reportSpam=rgba(229, 101, 85)
+chat_searchPanelIcons=rgba(86, 163, 219)
+chat_searchPanelText=rgba(78, 146, 204)
+chat_secretChatStatusText=black_40
+chat_secretTimerBackground=black.with_alpha(182)
+chat_secretTimerText=white
+chat_secretTimeText=white_80
+chat_selectedBackground=black_15
+chat_sentError=rgba(219, 53, 53)
+chat_sentErrorIcon=white
+chat_serviceBackground=black_10
+chat_serviceBackgroundSelected=black_20
+chat_serviceIcon=white
+chat_serviceLink=white
+chat_serviceText=white
+chat_status=white_80
+chat_stickerNameText=white
+chat_stickerReplyLine=white
+chat_stickerReplyMessageText=white
+chat_stickerReplyNameText=white
+chat_stickersHintPanel=black_10
+chat_stickerViaBotNameText=white
+chat_textSelectBackground=rgba(98, 169, 227, 102)
+chat_TextSelectionCursor=rgba(87, 183, 237, 255)
+chat_topPanelBackground=black
+chat_topPanelClose=black_30
+chat_topPanelLine=rgba(81, 154, 186)
+chat_topPanelMessage=white_80
+chat_topPanelTitle=rgba(81, 154, 186)
+chat_unreadMessagesStartArrowIcon=white_60
+chat_unreadMessagesStartBackground=black_20
+chat_unreadMessagesStartText=white_60
+chat_wallpaper_gradient_to=black
+chat_wallpaper=black
+chats_actionBackground=black_20
+chats_actionIcon=white
+chats_actionMessage=rgba(81, 154, 186)
+chats_actionPressedBackground=rgba(81, 154, 186)
+chats_archiveBackground=black_30
+chats_archivePinBackground=black_30
+chats_archivePullDownBackground=black_10
+chats_attachMessage=rgba(81, 154, 186)
+chats_date=black_40
+chats_draft=rgba(221, 75, 57)
+chats_mentionIcon=white
+chats_menuBackground=black
+chats_menuCloud=white
+chats_menuCloudBackgroundCats=white_60
+chats_menuItemCheck=rgba(81, 154, 186)
+chats_menuItemIcon=white_70
+chats_menuItemText=white_70
+chats_menuName=white
+chats_menuPhone=white_80
+chats_menuPhoneCats=white_80
+chats_menuTopBackgroundCats=black_10
+chats_menuTopShadow=black
+chats_menuTopShadowCats=black_10
+chats_message_threeLines=gray
+chats_message=white_60
+chats_messageArchived=gray
+chats_muteIcon=black_30
+chats_name=white_80
+chats_nameArchived=white_80
+chats_nameIcon=white
+chats_nameMessage_threeLines=white_80
+chats_nameMessage=rgba(81, 154, 186)
+chats_nameMessageArchived=white_60
+chats_onlineCircle=rgba(77, 166, 234, 255)
+chats_pinnedIcon=black_40
+chats_pinnedOverlay=black
+chats_secretIcon=rgba(113, 215, 86)
+chats_secretName=rgba(113, 215, 86)
+chats_sentCheck=white
+chats_sentClock=white_60
+chats_sentError=rgba(218, 86, 77)
+chats_sentErrorIcon=white
+chats_sentReadCheck=white
+chats_tabletSelectedOverlay=black_20
+chats_tabUnreadActiveBackground=white
+chats_tabUnreadUnactiveBackground=white_60
+chats_unreadCounter=rgba(0, 98, 163)
+chats_unreadCounterMuted=black_20
+chats_unreadCounterText=white
+chats_verifiedBackground=rgba(55, 169, 240)
+chats_verifiedCheck=white
+checkbox=black
+checkboxCheck=white
+checkboxSquareBackground=rgba(77, 166, 234)
+checkboxSquareCheck=white
+checkboxSquareDisabled=white_70
+checkboxSquareUnchecked=black_40
+contacts_inviteBackground=rgba(85, 190, 97)
+contacts_inviteText=white
+contextProgressInner1=rgba(191, 223, 246)
+contextProgressInner2=rgba(191, 223, 246)
+contextProgressInner3=white_70
+contextProgressOuter1=rgba(25, 167, 232)
+contextProgressOuter2=white
+contextProgressOuter3=white
+dialog_inlineProgressBackground=black_10
+dialog_liveLocationProgress=rgba(55, 169, 240)
+dialogBackground=black
+dialogBackgroundGray=black
+dialogBadgeBackground=rgba(62, 193, 249)
+dialogBadgeText=white
+dialogButton=rgba(78, 146, 204)
+dialogButtonSelector=white.with_alpha(20)
+dialogCameraIcon=white
+dialogCheckboxSquareBackground=rgba(77, 166, 234)
+dialogCheckboxSquareCheck=white
+dialogCheckboxSquareDisabled=white_70
+dialogCheckboxSquareUnchecked=black_40
+dialogGrayLine=white_80
+dialogIcon=gray
+dialogInputField=white_80
+dialogInputFieldActivated=rgba(55, 169, 240)
+dialogLineProgress=rgba(82, 125, 163)
+dialogLineProgressBackground=white_80
+dialogLinkSelection=rgba(98, 169, 227, 51)
+dialogProgressCircle=rgba(82, 125, 163)
+dialogRadioBackground=white_70
+dialogRadioBackgroundChecked=rgba(55, 169, 240)
+dialogRedIcon=light_red.with_alpha(222)
+dialogRoundCheckBox=rgba(62, 193, 249)
+dialogRoundCheckBoxCheck=white
+dialogScrollGlow=white_90
+dialogSearchBackground=black_20
+dialogSearchHint=gray
+dialogSearchIcon=gray
+dialogSearchText=white
+dialogShadowLine=black_10
+dialogTextBlack=white_90
+dialogTextBlue=rgba(52, 139, 193)
+dialogTextBlue2=rgba(58, 140, 207)
+dialogTextBlue3=rgba(62, 193, 249)
+dialogTextBlue4=rgba(25, 167, 232)
+dialogTextGray=rgba(52, 139, 193)
+dialogTextGray2=gray
+dialogTextGray3=white_60
+dialogTextGray4=white_70
+dialogTextHint=white_60
+dialogTextLink=rgba(58, 140, 207)
+dialogTextRed=rgba(205, 90, 90)
+dialogTextRed2=rgba(238, 104, 111, 255)
+dialogTopBackground=rgba(114, 181, 232)
+divider=transparent
+emptyListPlaceholder=black_30
+fastScrollActive=rgba(86, 163, 219)
+fastScrollInactive=black_40
+fastScrollText=white
+featuredStickers_addButton=rgba(77, 166, 234)
+featuredStickers_addButtonPressed=rgba(77, 166, 234)
+featuredStickers_addedIcon=rgba(77, 166, 234)
+featuredStickers_buttonProgress=white
+featuredStickers_buttonText=white
+featuredStickers_unread=rgba(77, 166, 234)
+files_folderIcon=white_70
+files_folderIconBackground=black
+files_iconText=white
+graySection=black
+groupcreate_checkbox=black
+groupcreate_checkboxCheck=white
+groupcreate_cursor=rgba(86, 163, 219)
+groupcreate_hintText=white_70
+groupcreate_offlineText=gray
+groupcreate_onlineText=rgba(58, 140, 207)
+groupcreate_sectionShadow=black
+groupcreate_sectionText=gray
+groupcreate_spanBackground=black
+groupcreate_spanText=white_90
+inappPlayerBackground=black
+inappPlayerClose=black_30
+inappPlayerPerformer=white_80
+inappPlayerPlayPause=rgba(98, 176, 235)
+inappPlayerTitle=white_80
+key_chat_messagePanelVoiceLock=white_70
+key_chat_messagePanelVoiceLockBackground=white
+key_chat_messagePanelVoiceLockShadow=black
+key_chats_menuTopShadow=transparent
+key_graySectionText=white_80
+key_player_progressCachedBackground=black_20
+key_sheet_other=white.with_alpha(67)
+key_sheet_scrollUp=white
+listSelector=white.with_alpha(64)
+listSelectorSDK21=white.with_alpha(64)
+location_liveLocationProgress=rgba(55, 169, 240)
+location_placeLocationBackground=rgba(77, 166, 234)
+location_sendLiveLocationBackground=rgba(255, 100, 100)
+location_sendLocationBackground=rgba(109, 160, 212)
+location_sendLocationIcon=white
+login_progressInner=rgba(217, 234, 251)
+login_progressOuter=rgba(109, 160, 212)
+musicPicker_buttonBackground=rgba(98, 176, 235)
+musicPicker_buttonIcon=white
+musicPicker_checkbox=rgba(41, 182, 247)
+musicPicker_checkboxCheck=white
+passport_authorizeBackground=rgba(77, 166, 234)
+passport_authorizeBackgroundSelected=rgba(58, 140, 207)
+passport_authorizeText=white
+picker_badge=rgba(41, 182, 247)
+picker_badgeText=white
+picker_disabledButton=white_60
+picker_enabledButton=rgba(25, 167, 232)
+player_actionBar=black_10
+player_actionBarItems=white
+player_actionBarSelector=black_10
+player_actionBarSubtitle=black_40
+player_actionBarTitle=white_90
+player_actionBarTop=black_10
+player_background=black
+player_button=gray
+player_buttonActive=rgba(41, 182, 247)
+player_placeholder=black_20
+player_placeholderBackground=white_90
+player_progress=rgba(41, 182, 247)
+player_progressBackground=black_20
+player_seekBarBackground=rgba(82, 82, 82, 71)
+player_time=gray
+profile_actionBackground=black_20
+profile_actionIcon=white_80
+profile_actionPressedBackground=black
+profile_adminIcon=gray
+profile_creatorIcon=rgba(78, 146, 204)
+profile_status=white
+profile_tabText=white_70
+profile_title=white
+profile_verifiedBackground=rgba(178, 214, 248)
+profile_verifiedCheck=white
+progressCircle=white_80
+radioBackground=white_70
+radioBackgroundChecked=rgba(55, 169, 240)
+returnToCallBackground=rgba(77, 166, 234)
+returnToCallText=white
+sessions_devicesImage=white_60
+sharedMedia_linkPlaceholder=white_90
+sharedMedia_linkPlaceholderText=white
+sharedMedia_startStopLoadIcon=rgba(55, 169, 240)
+statisticChartActivePickerChart=rgba(89, 104, 121, 216)
+statisticChartBackZoomColor=rgba(70, 170, 238, 255)
+statisticChartCheckboxInactive=white_60
+statisticChartChevronColor=rgba(118, 124, 133, 255)
+statisticChartHighlightColor=white.with_alpha(134)
+statisticChartHintLine=white.with_alpha(26)
+statisticChartInactivePickerChart=rgba(49, 58, 67, 216)
+statisticChartLine_blue=rgba(82, 159, 255, 255)
+statisticChartLine_golden=rgba(222, 172, 31, 255)
+statisticChartLine_green=rgba(61, 194, 63, 255)
+statisticChartLine_indigo=rgba(135, 92, 229, 255)
+statisticChartLine_lightblue=rgba(60, 120, 236, 255)
+statisticChartLine_lightgreen=rgba(143, 207, 57, 255)
+statisticChartLine_orange=rgba(233, 196, 26, 255)
+statisticChartLine_red=rgba(243, 76, 68, 255)
+statisticChartRipple=rgba(164, 189, 210, 44)
+statisticChartSignature=rgba(163, 177, 194, 183)
+statisticChartSignatureAlpha=white.with_alpha(139)
+stickers_menu=black_30
+stickers_menuSelector=black.with_alpha(47)
+switch2Track=rgba(255, 176, 173)
+switch2TrackChecked=rgba(162, 206, 248)
+switchThumb=white_70
+switchThumbChecked=white_90
+switchTrack=black_40
+switchTrackBlue=black_40
+switchTrackBlueChecked=rgba(119, 209, 255, 255)
+switchTrackBlueSelector=rgba(185, 221, 250, 25)
+switchTrackBlueSelectorChecked=rgba(140, 215, 255, 50)
+switchTrackBlueThumb=black_10
+switchTrackBlueThumbChecked=rgba(45, 130, 195, 255)
+switchTrackChecked=white_80
+undo_background=black_10
+undo_cancelColor=rgba(108, 183, 255, 255)
+voipgroup_topPanelGray=rgba(95, 115, 129, 255)
+wallpaperFileOffset=white
+windowBackgroundChecked=rgba(47, 118, 171, 255)
+windowBackgroundCheckText=white
+windowBackgroundGray=black
+windowBackgroundGrayShadow=black
+windowBackgroundUnchecked=black_10
+windowBackgroundWhite=black
+windowBackgroundWhiteBlackText=white_80
+windowBackgroundWhiteBlueHeader=white
+windowBackgroundWhiteBlueText=rgba(81, 154, 186)
+windowBackgroundWhiteBlueText2=rgba(52, 139, 193)
+windowBackgroundWhiteBlueText3=rgba(48, 121, 181)
+windowBackgroundWhiteBlueText4=rgba(78, 146, 204)
+windowBackgroundWhiteBlueText5=rgba(78, 146, 204)
+windowBackgroundWhiteBlueText6=rgba(58, 140, 207)
+windowBackgroundWhiteBlueText7=rgba(48, 121, 181)
+windowBackgroundWhiteGrayIcon=gray
+windowBackgroundWhiteGrayLine=white_80
+windowBackgroundWhiteGrayText=white_60
+windowBackgroundWhiteGrayText2=white_60
+windowBackgroundWhiteGrayText3=black_40
+windowBackgroundWhiteGrayText4=black_40
+windowBackgroundWhiteGrayText5=white_70
+windowBackgroundWhiteGrayText6=black_40
+windowBackgroundWhiteGrayText7=white_80
+windowBackgroundWhiteGrayText8=black_40
+windowBackgroundWhiteGreenText=rgba(38, 151, 44)
+windowBackgroundWhiteGreenText2=rgba(66, 195, 102)
+windowBackgroundWhiteHintText=white_60
+windowBackgroundWhiteInputField=white_80
+windowBackgroundWhiteInputFieldActivated=rgba(55, 169, 240)
+windowBackgroundWhiteLinkSelection=rgba(98, 169, 227, 51)
+windowBackgroundWhiteLinkText=rgba(81, 154, 186)
+windowBackgroundWhiteRedText=rgba(205, 90, 90)
+windowBackgroundWhiteRedText2=rgba(218, 86, 77)
+windowBackgroundWhiteRedText3=rgba(198, 73, 73)
+windowBackgroundWhiteRedText4=rgba(219, 53, 53)
+windowBackgroundWhiteRedText5=rgba(255, 72, 72)
+windowBackgroundWhiteRedText6=rgba(255, 100, 100)
+windowBackgroundWhiteValueText=rgba(81, 154, 186)
+'''
+
+true_black = theme_spec.from_text(TRUE_BLACK_PALETTE, TRUE_BLACK_KEYS)
+
+
+def build_theme(spec, ctx=None):
+    if ctx is None:
+        ctx = BuildContext()
+    with ctx.stats.phase('palette'):
+        plan = spec.compile(ctx)
+    with ctx.stats.phase('render'):
+        return plan.render()
+
+
+def rebuild_theme(spec, old, data, ctx=None):
+    # build_theme for a spec that changed from old, whose render is data.
+    # Returns None if the keys themselves were added, removed or reordered.
+    if ctx is None:
+        ctx = BuildContext()
+    removed, added, changed = old.diff(spec)
+    lines = data.split('\n')
+    if removed or added or list(old.keys) != list(spec.keys) or len(lines) != len(spec.keys):
+        return None
+    with ctx.stats.phase('palette'):
+        plan = spec.compile(ctx)
+    with ctx.stats.phase('render'):
+        return '\n'.join(plan.patch(lines, changed)), changed
+
+
+# Shared by every matrix worker, set once per process by _matrix_init
+_matrix_base = None
+
+
+def _matrix_init(lines, dynamic):
+    global _matrix_base
+    _matrix_base = (lines, dynamic)
+
+
+def _matrix_render(job):
+    v, path = job
+    lines, dynamic = _matrix_base
+    lines = list(lines)
+    remapped = {}
+    for i, key, argb in dynamic:
+        if argb not in remapped:
+            remapped[argb] = to_signed_32bit(v(argb))
+        lines[i] = f'{key}={remapped[argb]}'
+    write_if_changed(path, '\n'.join(lines))
+    return path
+
+
+def build_matrix(spec, accents, darkness_levels, outdir='.', prefix='true_black', jobs=None, cache=None,
+                 stats=None):
+    if stats is None:
+        stats = build_stats()
+    variants = [
+        variant(accent, darkness)
+        for accent in accents
+        for darkness in darkness_levels
+    ]
+    jobs_list = [
+        (v, os.path.join(outdir, f'{prefix}_{v.name}.attheme'))
+        for v in variants
+    ]
+    digests = {path: spec_digest(spec, v.name) for v, path in jobs_list}
+    if cache is not None:
+        jobs_list = [
+            (v, path) for v, path in jobs_list
+            if cache.lookup(path, digests[path]) is None
+        ]
+    if not jobs_list:
+        return []
+
+    # Keys the variants can't touch are formatted once up front, the rest
+    # are handed to the workers as (line, key, base colour)
+    with stats.phase('palette'):
+        probe = variant()
+        lines = []
+        dynamic = []
+        for i, (key, argb) in enumerate(spec.resolved_keys().items()):
+            if probe.is_static(argb):
+                lines.append(f'{key}={to_signed_32bit(argb)}')
+            else:
+                lines.append(None)
+                dynamic.append((i, key, argb))
+
+    os.makedirs(outdir, exist_ok=True)
+    with stats.phase('render'):
+        with ProcessPoolExecutor(jobs, initializer=_matrix_init, initargs=(lines, dynamic)) as ex:
+            paths = list(ex.map(_matrix_render, jobs_list))
+    if cache is not None:
+        for path in paths:
+            cache.store(path, digests[path])
+        cache.save()
+    return paths
+
+
+def matrix_main(argv):
+    parser = argparse.ArgumentParser(prog='build.py matrix')
+    parser.add_argument(
+        '-a', '--accents', default='base',
+        help='comma separated accent colours as hex, "base" keeps the original accent'
+    )
+    parser.add_argument('-k', '--darkness', default='0', help='comma separated darkness levels (0-114)')
+    parser.add_argument('-o', '--outdir', default='variants')
+    parser.add_argument('-j', '--jobs', type=int, default=None)
+    parser.add_argument('-f', '--force', action='store_true', help='ignore the build cache')
+    parser.add_argument('--stats', metavar='FILE', help='write build timings as JSON, - for stdout')
+    args = parser.parse_args(argv)
+
+    accents = [
+        None if a == 'base' else hex_to_tuple(a)
+        for a in args.accents.split(',')
+    ]
+    darkness_levels = [int(d) for d in args.darkness.split(',')]
+    cache = None if args.force else build_cache()
+    stats = build_stats()
+    paths = build_matrix(
+        true_black, accents, darkness_levels, args.outdir, jobs=args.jobs, cache=cache, stats=stats
+    )
+    for path in paths:
+        print(path)
+    print(len(paths), 'variant(s) rebuilt')
+    if args.stats:
+        traced, rss = peak_memory()
+        write_stats(args.stats, {
+            'timings': stats.timings,
+            'variants_rendered': len(paths),
+            'keys_per_variant': len(true_black.keys),
+            'peak_rss_kib': rss,
+        })
+
+
+def traced_peak(spec, **options):
+    # Peak bytes traced over a build and its warnings. tracemalloc slows
+    # every allocation down, so this is a separate run from the timed one.
+    import tracemalloc
+    tracemalloc.start()
+    try:
+        ctx = BuildContext(**options)
+        build_theme(spec, ctx)
+        list(ctx.warnings())
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def write_stats(path, report):
+    text = json.dumps(report, indent=1)
+    if path == '-':
+        print(text)
+    else:
+        with open(path, 'w') as f:
+            f.write(text + '\n')
+
+
+def main(argv):
+    if argv[1:2] == ['matrix']:
+        return matrix_main(argv[2:])
+    if argv[1:2] == ['watch']:
+        import watch
+        return watch.main(argv[2:])
+    if argv[1:2] == ['export']:
+        import export
+        return export.main(argv[2:])
+
+    parser = argparse.ArgumentParser(prog='build.py', epilog='see also: build.py matrix -h, build.py watch -h, build.py export -h')
+    parser.add_argument(
+        '-d', '--debug', action='store_true',
+        help='give every key its own colour and write a legend (needs numpy)'
+    )
+    parser.add_argument('--seed', type=int, default=0, help='reshuffles the -d colours')
+    parser.add_argument('-f', '--force', action='store_true', help='ignore the build cache')
+    parser.add_argument(
+        '-n', '--near', type=float, default=None,
+        help='distance under which colours are reported as near duplicates, 0 to disable'
+    )
+    parser.add_argument(
+        '-s', '--space', choices=NEAR_THRESHOLDS, default='rgb',
+        help='colour space for near duplicates, oklab and lab need numpy'
+    )
+    parser.add_argument('-a', '--audit', action='store_true', help='check text/icon contrast (needs numpy)')
+    parser.add_argument(
+        '-c', '--composite', action='store_true',
+        help='warn about translucent keys that vanish or collide over their backdrop (needs numpy)'
+    )
+    parser.add_argument('--stats', metavar='FILE', help='write build timings and counters as JSON, - for stdout')
+    parser.add_argument(
+        '--trace-memory', action='store_true',
+        help='with --stats, also report the traced peak of a second, untimed build'
+    )
+    parser.add_argument('--profile', metavar='FILE', help='write a cProfile dump of the build')
+    args = parser.parse_args(argv[1:])
+
+    # measuring means building, so a cached result is never reused
+    measure = args.stats or args.profile
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    debug_colours = None
+    if args.debug:
+        import debugcolours
+        debug_colours = debugcolours.assign(true_black.keys, args.seed)
+
+    ctx = BuildContext(
+        gen_debug=args.debug, near_threshold=args.near, near_space=args.space,
+        composite=args.composite, debug_colours=debug_colours
+    )
+
+    filename = 'true_black'
+    if ctx.gen_debug:
+        filename += '_dbg'
+    path = f'{filename}.attheme'
+
+    cache = None if args.force or measure else build_cache()
+    options = [
+        f'near={ctx.near_threshold}', ctx.near_space, f'composite={ctx.composite}',
+        f'debug={args.seed if args.debug else None}'
+    ]
+    digest = spec_digest(true_black, *options)
+    entry = cache.lookup(path, digest) if cache is not None else None
+
+    if entry is None:
+        # a spec edit only re-renders the keys whose colour changed
+        result = None
+        previous = cache.previous(path) if cache is not None else None
+        if previous is not None and previous.get('options') == options:
+            with open(path) as f:
+                result = rebuild_theme(true_black, theme_spec.from_source(previous['source']), f.read(), ctx)
+        if result is None:
+            data = build_theme(true_black, ctx)
+        else:
+            data, changed = result
+            print(f'{path}: {len(changed)} changed key(s) re-rendered')
+        with ctx.stats.phase('write'):
+            write_if_changed(path, data)
+        with ctx.stats.phase('warnings'):
+            entry = {
+                'warnings': list(ctx.warnings()), 'usage_counter': ctx.usage_counter,
+                'options': options, 'source': true_black.source(),
+            }
+        if cache is not None:
+            cache.store(path, digest, **entry)
+            cache.save()
+    else:
+        print(f'{path} is up to date')
+
+    if debug_colours is not None:
+        legend_path = f'{filename}.legend.json'
+        write_if_changed(legend_path, json.dumps(debugcolours.legend(debug_colours), indent=1))
+        print(f'legend written to {legend_path}')
+
+    if not ctx.gen_debug:
+        print_warnings(entry['warnings'])
+        if args.audit:
+            import contrast
+            with ctx.stats.phase('audit'):
+                failures = contrast.audit(true_black.resolved_keys())
+            contrast.print_failures(failures)
+
+    print(entry['usage_counter'], 'colours')
+
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+    if args.stats:
+        report = ctx.report()
+        if args.trace_memory:
+            report['peak_traced_bytes'] = traced_peak(
+                true_black, gen_debug=args.debug, near_threshold=args.near, near_space=args.space,
+                composite=args.composite, debug_colours=debug_colours
+            )
+        write_stats(args.stats, report)
+
 
-if len(sys.argv) >= 2 and sys.argv[1] == '-d':
-    rgba.gen_debug = True
-
-data = f'''
-actionBarActionModeDefault={black}
-actionBarActionModeDefaultIcon={white_90}
-actionBarActionModeDefaultSelector={black_20}
-actionBarActionModeDefaultTop={black_10}
-actionBarDefault={black}
-actionBarDefaultArchived={black}
-actionBarDefaultArchivedIcon={white}
-actionBarDefaultArchivedSelector={black_20}
-actionBarDefaultArchivedTitle={white}
-actionBarDefaultIcon={white}
-actionBarDefaultSearch={white}
-actionBarDefaultSearchPlaceholder={white.with_alpha(128)}
-actionBarDefaultSelector={black_40}
-actionBarDefaultSubmenuBackground={black_10}
-actionBarDefaultSubmenuItem={white_90}
-actionBarDefaultSubmenuItemIcon={white_90}
-actionBarDefaultSubtitle={white_60}
-actionBarDefaultTitle={white}
-actionBarTabActiveText={white}
-actionBarTabLine={white}
-actionBarTabSelector={white_60}
-actionBarTabUnactiveText={white_60}
-actionBarWhiteSelector={black.with_alpha(47)}
-avatar_actionBarIconBlue={white}
-avatar_actionBarIconCyan={white}
-avatar_actionBarIconGreen={white}
-avatar_actionBarIconOrange={white}
-avatar_actionBarIconPink={white}
-avatar_actionBarIconRed={white}
-avatar_actionBarIconViolet={white}
-avatar_actionBarSelectorBlue={black}
-avatar_actionBarSelectorCyan={white_60}
-avatar_actionBarSelectorGreen={white_60}
-avatar_actionBarSelectorOrange={white_60}
-avatar_actionBarSelectorPink={white_60}
-avatar_actionBarSelectorRed={white_60}
-avatar_actionBarSelectorViolet={white_60}
-avatar_backgroundActionBarBlue={black_10}
-avatar_backgroundActionBarCyan={black_10}
-avatar_backgroundActionBarGreen={black_10}
-avatar_backgroundActionBarOrange={black_10}
-avatar_backgroundActionBarPink={black_10}
-avatar_backgroundActionBarRed={black_10}
-avatar_backgroundActionBarViolet={black_10}
-avatar_backgroundArchived={black_30}
-avatar_backgroundArchivedHidden={black_10}
-avatar_backgroundBlue={rgba(86, 163, 219)}
-avatar_backgroundCyan={rgba(95, 190, 213)}
-avatar_backgroundGreen={rgba(118, 200, 77)}
-avatar_backgroundGroupCreateSpanBlue={black}
-avatar_backgroundInProfileBlue={black}
-avatar_backgroundOrange={rgba(242, 140, 72)}
-avatar_backgroundPink={rgba(242, 116, 154)}
-avatar_backgroundRed={rgba(229, 101, 85)}
-avatar_backgroundSaved={rgba(102, 191, 250)}
-avatar_backgroundViolet={rgba(142, 133, 238)}
-avatar_nameInMessageBlue={rgba(78, 146, 204)}
-avatar_nameInMessageCyan={rgba(66, 177, 168)}
-avatar_nameInMessageGreen={rgba(103, 179, 93)}
-avatar_nameInMessageOrange={rgba(220, 136, 89)}
-avatar_nameInMessagePink={rgba(78, 146, 204)}
-avatar_nameInMessageRed={rgba(205, 90, 90)}
-avatar_nameInMessageViolet={rgba(78, 146, 204)}
-avatar_subtitleInProfileBlue={white_80}
-avatar_subtitleInProfileCyan={white_80}
-avatar_subtitleInProfileGreen={white_80}
-avatar_subtitleInProfileOrange={white_80}
-avatar_subtitleInProfilePink={white_80}
-avatar_subtitleInProfileRed={white_80}
-avatar_subtitleInProfileViolet={white_80}
-avatar_text={white_90}
-calls_callReceivedGreenIcon={rgba(0, 200, 83)}
-calls_callReceivedRedIcon={rgba(255, 72, 72)}
-changephoneinfo_image={white_70}
-chat_addContact={rgba(86, 163, 219)}
-chat_adminSelectedText={white_60}
-chat_adminText={white_60}
-chat_attachActiveTab={rgba(106, 191, 255, 255)}
-chat_attachAudioBackground={rgba(242, 140, 72)}
-chat_attachAudioIcon={white}
-chat_attachCameraIcon1={rgba(255, 125, 48)}
-chat_attachContactBackground={rgba(222, 176, 69, 255)}
-chat_attachContactIcon={white}
-chat_attachFileBackground={rgba(90, 188, 244, 255)}
-chat_attachFileIcon={white}
-chat_attachGalleryBackground={rgba(77, 150, 245, 255)}
-chat_attachGalleryIcon={white}
-chat_attachHideBackground={white_70}
-chat_attachLocationIcon={white}
-chat_attachPollBackground={rgba(222, 176, 69, 255)}
-chat_attachSendBackground={rgba(62, 193, 249)}
-chat_attachUnactiveTab={rgba(109, 145, 166, 255)}
-chat_botButtonText={white}
-chat_botKeyboardButtonBackground={black_10}
-chat_botKeyboardButtonBackgroundPressed={black_20}
-chat_botKeyboardButtonText={white}
-chat_botProgress={white}
-chat_botSwitchToInlineText={rgba(58, 140, 207)}
-chat_editDoneIcon={rgba(81, 189, 243)}
-chat_emojiBottomPanelIcon={black_40}
-chat_emojiPanelBackground={black}
-chat_emojiPanelBackspace={black_40}
-chat_emojiPanelBadgeBackground={rgba(77, 166, 234)}
-chat_emojiPanelBadgeText={white}
-chat_emojiPanelEmptyText={black_40}
-chat_emojiPanelIcon={black_40}
-chat_emojiPanelIconSelected={white}
-chat_emojiPanelIconSelector={white}
-chat_emojiPanelMasksIcon={white}
-chat_emojiPanelMasksIconSelected={rgba(98, 191, 232)}
-chat_emojiPanelNewTrending={rgba(77, 166, 234)}
-chat_emojiPanelShadowLine={black_30}
-chat_emojiPanelStickerPackSelector={black_10}
-chat_emojiPanelStickerPackSelectorLine={rgba(100, 181, 239, 255)}
-chat_emojiPanelStickerSetName={white_60}
-chat_emojiPanelStickerSetNameIcon={white_70}
-chat_emojiPanelTrendingDescription={black_40}
-chat_emojiPanelTrendingTitle={white_60}
-chat_emojiSearchBackground={black_10}
-chat_emojiSearchIcon={black_45}
-chat_fieldOverlayText={rgba(58, 140, 207)}
-chat_gifSaveHintBackground={rgba(17, 17, 17, 204)}
-chat_gifSaveHintText={white}
-chat_goDownButton={black_30}
-chat_goDownButtonCounter={white}
-chat_goDownButtonCounterBackground={rgba(77, 166, 234)}
-chat_goDownButtonIcon={white_80}
-chat_goDownButtonShadow={black}
-chat_inAudioCacheSeekbar={gray}
-chat_inAudioDurationSelectedText={white_60}
-chat_inAudioDurationText={white_60}
-chat_inAudioPerfomerSelectedText={white_60}
-chat_inAudioPerfomerText={white_60}
-chat_inAudioProgress={black_20}
-chat_inAudioSeekbar={black_10}
-chat_inAudioSeekbarFill={rgba(114, 181, 232)}
-chat_inAudioSeekbarSelected={black_40}
-chat_inAudioSelectedProgress={black_20}
-chat_inAudioTitleText={white_80}
-chat_inBubble={black_10}
-chat_inBubbleSelected={black_20}
-chat_inBubbleShadow={transparent}
-chat_inContactBackground={rgba(114, 181, 232)}
-chat_inContactIcon={black_20}
-chat_inContactNameText={rgba(81, 154, 186)}
-chat_inContactPhoneSelectedText={black_20}
-chat_inContactPhoneText={white_60}
-chat_inFileBackground={white_60}
-chat_inFileBackgroundSelected={white_60}
-chat_inFileIcon={black_20}
-chat_inFileInfoSelectedText={white_60}
-chat_inFileInfoText={white_60}
-chat_inFileNameText={white_80}
-chat_inFileProgress={white_60}
-chat_inFileProgressSelected={white_60}
-chat_inFileSelectedIcon={black_20}
-chat_inForwardedNameText={rgba(81, 154, 186)}
-chat_inInstant={rgba(58, 140, 207)}
-chat_inInstantSelected={rgba(48, 121, 181)}
-chat_inlineResultIcon={rgba(78, 146, 204)}
-chat_inLoader={black_20}
-chat_inLoaderPhoto={black_20}
-chat_inLoaderPhotoIcon={white_60}
-chat_inLoaderPhotoIconSelected={white_80}
-chat_inLoaderPhotoSelected={black_40}
-chat_inLoaderSelected={black_40}
-chat_inLocationBackground={white_80}
-chat_inLocationIcon={black_20}
-chat_inMediaIcon={white_80}
-chat_inMediaIconSelected={white}
-chat_inMenu={white_60}
-chat_inMenuSelected={white_60}
-chat_inPreviewInstantSelectedText={rgba(81, 154, 186)}
-chat_inPreviewInstantText={rgba(81, 154, 186)}
-chat_inPreviewLine={rgba(81, 154, 186)}
-chat_inReplyLine={rgba(81, 154, 186)}
-chat_inReplyMediaMessageSelectedText={white_60}
-chat_inReplyMediaMessageText={white_60}
-chat_inReplyMessageText={white_60}
-chat_inReplyNameText={rgba(81, 154, 186)}
-chat_inSentClock={white_80}
-chat_inSentClockSelected={white_80}
-chat_inSiteNameText={rgba(81, 154, 186)}
-chat_inTextSelectionHighlight={rgba(78, 180, 243, 90)}
-chat_inTimeSelectedText={white_60}
-chat_inTimeText={white_60}
-chat_inVenueInfoSelectedText={white_60}
-chat_inVenueInfoText={rgba(93, 111, 128)}
-chat_inViaBotNameText={rgba(91, 175, 211)}
-chat_inViews={white_60}
-chat_inViewsSelected={white_60}
-chat_inVoiceSeekbar={white_60}
-chat_inVoiceSeekbarFill={gray}
-chat_inVoiceSeekbarSelected={white}
-chat_linkSelectBackground={rgba(98, 169, 227, 51)}
-chat_lockIcon={white}
-chat_mediaBroadcast={white}
-chat_mediaInfoText={white}
-chat_mediaLoaderPhoto={black.with_alpha(102)}
-chat_mediaLoaderPhotoIcon={white}
-chat_mediaLoaderPhotoIconSelected={white_80}
-chat_mediaLoaderPhotoSelected={black.with_alpha(128)}
-chat_mediaMenu={black}
-chat_mediaProgress={white}
-chat_mediaSentCheck={white}
-chat_mediaSentClock={white}
-chat_mediaTimeBackground={black.with_alpha(102)}
-chat_mediaTimeText={white}
-chat_mediaViews={white}
-chat_messageLinkIn={rgba(86, 163, 219)}
-chat_messageLinkOut={rgba(86, 163, 219)}
-chat_messagePanelBackground={black}
-chat_messagePanelCancelInlineBot={white_70}
-chat_messagePanelCursor={white_70}
-chat_messagePanelHint={white_60.with_alpha(201)}
-chat_messagePanelIcons={black_40}
-chat_messagePanelSend={rgba(98, 176, 235)}
-chat_messagePanelShadow={black}
-chat_messagePanelText={white}
-chat_messagePanelVoiceBackground={rgba(78, 146, 204)}
-chat_messagePanelVoiceDelete={black_40}
-chat_messagePanelVoiceDuration={white}
-chat_messagePanelVoicePressed={white}
-chat_messageTextIn={white}
-chat_messageTextOut={white}
-chat_muteIcon={white_80}
-chat_outAudioCacheSeekbar={gray}
-chat_outAudioDurationSelectedText={white_60}
-chat_outAudioDurationText={white_60}
-chat_outAudioPerfomerSelectedText={white_60}
-chat_outAudioPerfomerText={white_60}
-chat_outAudioProgress={black_20}
-chat_outAudioSeekbar={black_30}
-chat_outAudioSeekbarFill={gray}
-chat_outAudioSeekbarSelected={gray}
-chat_outAudioSelectedProgress={black_20}
-chat_outAudioTitleText={white_80}
-chat_outBroadcast={rgba(70, 170, 54)}
-chat_outBubble={black_10}
-chat_outBubbleSelected={black_20}
-chat_outBubbleShadow={transparent}
-chat_outContactBackground={white_80}
-chat_outContactIcon={black_20}
-chat_outContactNameText={rgba(81, 154, 186)}
-chat_outContactPhoneSelectedText={rgba(148, 211, 246, 255)}
-chat_outContactPhoneText={white_80}
-chat_outFileBackground={white_60}
-chat_outFileBackgroundSelected={white_60}
-chat_outFileIcon={black_20}
-chat_outFileInfoSelectedText={white_60}
-chat_outFileInfoText={white_60}
-chat_outFileNameText={white_80}
-chat_outFileProgress={white_60}
-chat_outFileProgressSelected={white_60}
-chat_outFileSelectedIcon={black_20}
-chat_outForwardedNameText={rgba(81, 154, 186)}
-chat_outInstant={rgba(81, 154, 186)}
-chat_outInstantSelected={rgba(81, 154, 186)}
-chat_outLoader={black_20}
-chat_outLoaderPhoto={black_20}
-chat_outLoaderPhotoIcon={white_60}
-chat_outLoaderPhotoIconSelected={white_80}
-chat_outLoaderPhotoSelected={black_40}
-chat_outLoaderSelected={black_40}
-chat_outLocationBackground={white_80}
-chat_outLocationIcon={black_20}
-chat_outMediaIcon={white_80}
-chat_outMediaIconSelected={white}
-chat_outMenu={white_60}
-chat_outMenuSelected={white_60}
-chat_outPreviewInstantSelectedText={rgba(81, 154, 186)}
-chat_outPreviewInstantText={rgba(81, 154, 186)}
-chat_outPreviewLine={rgba(81, 154, 186)}
-chat_outReplyLine={rgba(81, 154, 186)}
-chat_outReplyMediaMessageSelectedText={white_60}
-chat_outReplyMediaMessageText={white_60}
-chat_outReplyMessageText={white_60}
-chat_outReplyNameText={rgba(81, 154, 186)}
-chat_outSentCheck={white}
-chat_outSentCheckRead={white}
-chat_outSentCheckReadSelected={white}
-chat_outSentCheckSelected={white}
-chat_outSentClock={white_80}
-chat_outSentClockSelected={white_80}
-chat_outSiteNameText={rgba(81, 154, 186)}
-chat_outTextSelectionHighlight={rgba(126, 192, 237, 126)}
-chat_outTimeSelectedText={white_60}
-chat_outTimeText={white_60}
-chat_outUpCall={white}
-chat_outVenueInfoSelectedText={white_60}
-chat_outVenueInfoText={white_60}
-chat_outVenueNameText={white_80}
-chat_outViaBotNameText={rgba(58, 140, 207)}
-chat_outViews={white_60}
-chat_outViewsSelected={white_60}
-chat_outVoiceSeekbar={white_60}
-chat_outVoiceSeekbarFill={gray}
-chat_outVoiceSeekbarSelected={white}
-chat_previewDurationText={white}
-chat_previewGameText={white}
-chat_recordedVoiceBackground={rgba(86, 163, 219)}
-chat_recordedVoiceDot={rgba(218, 86, 77)}
-chat_recordedVoicePlayPause={white}
-chat_recordedVoicePlayPausePressed={rgba(217, 234, 251)}
-chat_recordedVoiceProgress={rgba(162, 206, 248)}
-chat_recordedVoiceProgressInner={white}
-chat_recordTime={black_30}
-chat_recordVoiceCancel={white_60}
-chat_replyPanelClose={white_70}
-chat_replyPanelIcons={rgba(77, 166, 234)}
-chat_replyPanelLine={transparent}
-chat_replyPanelMessage={white_80}
-chat_replyPanelName={rgba(58, 140, 207)}
-chat_reportSpam={rgba(229, 101, 85)}
-chat_searchPanelIcons={rgba(86, 163, 219)}
-chat_searchPanelText={rgba(78, 146, 204)}
-chat_secretChatStatusText={black_40}
-chat_secretTimerBackground={black.with_alpha(182)}
-chat_secretTimerText={white}
-chat_secretTimeText={white_80}
-chat_selectedBackground={black_15}
-chat_sentError={rgba(219, 53, 53)}
-chat_sentErrorIcon={white}
-chat_serviceBackground={black_10}
-chat_serviceBackgroundSelected={black_20}
-chat_serviceIcon={white}
-chat_serviceLink={white}
-chat_serviceText={white}
-chat_status={white_80}
-chat_stickerNameText={white}
-chat_stickerReplyLine={white}
-chat_stickerReplyMessageText={white}
-chat_stickerReplyNameText={white}
-chat_stickersHintPanel={black_10}
-chat_stickerViaBotNameText={white}
-chat_textSelectBackground={rgba(98, 169, 227, 102)}
-chat_TextSelectionCursor={rgba(87, 183, 237, 255)}
-chat_topPanelBackground={black}
-chat_topPanelClose={black_30}
-chat_topPanelLine={rgba(81, 154, 186)}
-chat_topPanelMessage={white_80}
-chat_topPanelTitle={rgba(81, 154, 186)}
-chat_unreadMessagesStartArrowIcon={white_60}
-chat_unreadMessagesStartBackground={black_20}
-chat_unreadMessagesStartText={white_60}
-chat_wallpaper_gradient_to={black}
-chat_wallpaper={black}
-chats_actionBackground={black_20}
-chats_actionIcon={white}
-chats_actionMessage={rgba(81, 154, 186)}
-chats_actionPressedBackground={rgba(81, 154, 186)}
-chats_archiveBackground={black_30}
-chats_archivePinBackground={black_30}
-chats_archivePullDownBackground={black_10}
-chats_attachMessage={rgba(81, 154, 186)}
-chats_date={black_40}
-chats_draft={rgba(221, 75, 57)}
-chats_mentionIcon={white}
-chats_menuBackground={black}
-chats_menuCloud={white}
-chats_menuCloudBackgroundCats={white_60}
-chats_menuItemCheck={rgba(81, 154, 186)}
-chats_menuItemIcon={white_70}
-chats_menuItemText={white_70}
-chats_menuName={white}
-chats_menuPhone={white_80}
-chats_menuPhoneCats={white_80}
-chats_menuTopBackgroundCats={black_10}
-chats_menuTopShadow={black}
-chats_menuTopShadowCats={black_10}
-chats_message_threeLines={gray}
-chats_message={white_60}
-chats_messageArchived={gray}
-chats_muteIcon={black_30}
-chats_name={white_80}
-chats_nameArchived={white_80}
-chats_nameIcon={white}
-chats_nameMessage_threeLines={white_80}
-chats_nameMessage={rgba(81, 154, 186)}
-chats_nameMessageArchived={white_60}
-chats_onlineCircle={rgba(77, 166, 234, 255)}
-chats_pinnedIcon={black_40}
-chats_pinnedOverlay={black}
-chats_secretIcon={rgba(113, 215, 86)}
-chats_secretName={rgba(113, 215, 86)}
-chats_sentCheck={white}
-chats_sentClock={white_60}
-chats_sentError={rgba(218, 86, 77)}
-chats_sentErrorIcon={white}
-chats_sentReadCheck={white}
-chats_tabletSelectedOverlay={black_20}
-chats_tabUnreadActiveBackground={white}
-chats_tabUnreadUnactiveBackground={white_60}
-chats_unreadCounter={rgba(0, 98, 163)}
-chats_unreadCounterMuted={black_20}
-chats_unreadCounterText={white}
-chats_verifiedBackground={rgba(55, 169, 240)}
-chats_verifiedCheck={white}
-checkbox={black}
-checkboxCheck={white}
-checkboxSquareBackground={rgba(77, 166, 234)}
-checkboxSquareCheck={white}
-checkboxSquareDisabled={white_70}
-checkboxSquareUnchecked={black_40}
-contacts_inviteBackground={rgba(85, 190, 97)}
-contacts_inviteText={white}
-contextProgressInner1={rgba(191, 223, 246)}
-contextProgressInner2={rgba(191, 223, 246)}
-contextProgressInner3={white_70}
-contextProgressOuter1={rgba(25, 167, 232)}
-contextProgressOuter2={white}
-contextProgressOuter3={white}
-dialog_inlineProgressBackground={black_10}
-dialog_liveLocationProgress={rgba(55, 169, 240)}
-dialogBackground={black}
-dialogBackgroundGray={black}
-dialogBadgeBackground={rgba(62, 193, 249)}
-dialogBadgeText={white}
-dialogButton={rgba(78, 146, 204)}
-dialogButtonSelector={white.with_alpha(20)}
-dialogCameraIcon={white}
-dialogCheckboxSquareBackground={rgba(77, 166, 234)}
-dialogCheckboxSquareCheck={white}
-dialogCheckboxSquareDisabled={white_70}
-dialogCheckboxSquareUnchecked={black_40}
-dialogGrayLine={white_80}
-dialogIcon={gray}
-dialogInputField={white_80}
-dialogInputFieldActivated={rgba(55, 169, 240)}
-dialogLineProgress={rgba(82, 125, 163)}
-dialogLineProgressBackground={white_80}
-dialogLinkSelection={rgba(98, 169, 227, 51)}
-dialogProgressCircle={rgba(82, 125, 163)}
-dialogRadioBackground={white_70}
-dialogRadioBackgroundChecked={rgba(55, 169, 240)}
-dialogRedIcon={light_red.with_alpha(222)}
-dialogRoundCheckBox={rgba(62, 193, 249)}
-dialogRoundCheckBoxCheck={white}
-dialogScrollGlow={white_90}
-dialogSearchBackground={black_20}
-dialogSearchHint={gray}
-dialogSearchIcon={gray}
-dialogSearchText={white}
-dialogShadowLine={black_10}
-dialogTextBlack={white_90}
-dialogTextBlue={rgba(52, 139, 193)}
-dialogTextBlue2={rgba(58, 140, 207)}
-dialogTextBlue3={rgba(62, 193, 249)}
-dialogTextBlue4={rgba(25, 167, 232)}
-dialogTextGray={rgba(52, 139, 193)}
-dialogTextGray2={gray}
-dialogTextGray3={white_60}
-dialogTextGray4={white_70}
-dialogTextHint={white_60}
-dialogTextLink={rgba(58, 140, 207)}
-dialogTextRed={rgba(205, 90, 90)}
-dialogTextRed2={rgba(238, 104, 111, 255)}
-dialogTopBackground={rgba(114, 181, 232)}
-divider={transparent}
-emptyListPlaceholder={black_30}
-fastScrollActive={rgba(86, 163, 219)}
-fastScrollInactive={black_40}
-fastScrollText={white}
-featuredStickers_addButton={rgba(77, 166, 234)}
-featuredStickers_addButtonPressed={rgba(77, 166, 234)}
-featuredStickers_addedIcon={rgba(77, 166, 234)}
-featuredStickers_buttonProgress={white}
-featuredStickers_buttonText={white}
-featuredStickers_unread={rgba(77, 166, 234)}
-files_folderIcon={white_70}
-files_folderIconBackground={black}
-files_iconText={white}
-graySection={black}
-groupcreate_checkbox={black}
-groupcreate_checkboxCheck={white}
-groupcreate_cursor={rgba(86, 163, 219)}
-groupcreate_hintText={white_70}
-groupcreate_offlineText={gray}
-groupcreate_onlineText={rgba(58, 140, 207)}
-groupcreate_sectionShadow={black}
-groupcreate_sectionText={gray}
-groupcreate_spanBackground={black}
-groupcreate_spanText={white_90}
-inappPlayerBackground={black}
-inappPlayerClose={black_30}
-inappPlayerPerformer={white_80}
-inappPlayerPlayPause={rgba(98, 176, 235)}
-inappPlayerTitle={white_80}
-key_chat_messagePanelVoiceLock={white_70}
-key_chat_messagePanelVoiceLockBackground={white}
-key_chat_messagePanelVoiceLockShadow={black}
-key_chats_menuTopShadow={transparent}
-key_graySectionText={white_80}
-key_player_progressCachedBackground={black_20}
-key_sheet_other={white.with_alpha(67)}
-key_sheet_scrollUp={white}
-listSelector={white.with_alpha(64)}
-listSelectorSDK21={white.with_alpha(64)}
-location_liveLocationProgress={rgba(55, 169, 240)}
-location_placeLocationBackground={rgba(77, 166, 234)}
-location_sendLiveLocationBackground={rgba(255, 100, 100)}
-location_sendLocationBackground={rgba(109, 160, 212)}
-location_sendLocationIcon={white}
-login_progressInner={rgba(217, 234, 251)}
-login_progressOuter={rgba(109, 160, 212)}
-musicPicker_buttonBackground={rgba(98, 176, 235)}
-musicPicker_buttonIcon={white}
-musicPicker_checkbox={rgba(41, 182, 247)}
-musicPicker_checkboxCheck={white}
-passport_authorizeBackground={rgba(77, 166, 234)}
-passport_authorizeBackgroundSelected={rgba(58, 140, 207)}
-passport_authorizeText={white}
-picker_badge={rgba(41, 182, 247)}
-picker_badgeText={white}
-picker_disabledButton={white_60}
-picker_enabledButton={rgba(25, 167, 232)}
-player_actionBar={black_10}
-player_actionBarItems={white}
-player_actionBarSelector={black_10}
-player_actionBarSubtitle={black_40}
-player_actionBarTitle={white_90}
-player_actionBarTop={black_10}
-player_background={black}
-player_button={gray}
-player_buttonActive={rgba(41, 182, 247)}
-player_placeholder={black_20}
-player_placeholderBackground={white_90}
-player_progress={rgba(41, 182, 247)}
-player_progressBackground={black_20}
-player_seekBarBackground={rgba(82, 82, 82, 71)}
-player_time={gray}
-profile_actionBackground={black_20}
-profile_actionIcon={white_80}
-profile_actionPressedBackground={black}
-profile_adminIcon={gray}
-profile_creatorIcon={rgba(78, 146, 204)}
-profile_status={white}
-profile_tabText={white_70}
-profile_title={white}
-profile_verifiedBackground={rgba(178, 214, 248)}
-profile_verifiedCheck={white}
-progressCircle={white_80}
-radioBackground={white_70}
-radioBackgroundChecked={rgba(55, 169, 240)}
-returnToCallBackground={rgba(77, 166, 234)}
-returnToCallText={white}
-sessions_devicesImage={white_60}
-sharedMedia_linkPlaceholder={white_90}
-sharedMedia_linkPlaceholderText={white}
-sharedMedia_startStopLoadIcon={rgba(55, 169, 240)}
-statisticChartActivePickerChart={rgba(89, 104, 121, 216)}
-statisticChartBackZoomColor={rgba(70, 170, 238, 255)}
-statisticChartCheckboxInactive={white_60}
-statisticChartChevronColor={rgba(118, 124, 133, 255)}
-statisticChartHighlightColor={white.with_alpha(134)}
-statisticChartHintLine={white.with_alpha(26)}
-statisticChartInactivePickerChart={rgba(49, 58, 67, 216)}
-statisticChartLine_blue={rgba(82, 159, 255, 255)}
-statisticChartLine_golden={rgba(222, 172, 31, 255)}
-statisticChartLine_green={rgba(61, 194, 63, 255)}
-statisticChartLine_indigo={rgba(135, 92, 229, 255)}
-statisticChartLine_lightblue={rgba(60, 120, 236, 255)}
-statisticChartLine_lightgreen={rgba(143, 207, 57, 255)}
-statisticChartLine_orange={rgba(233, 196, 26, 255)}
-statisticChartLine_red={rgba(243, 76, 68, 255)}
-statisticChartRipple={rgba(164, 189, 210, 44)}
-statisticChartSignature={rgba(163, 177, 194, 183)}
-statisticChartSignatureAlpha={white.with_alpha(139)}
-stickers_menu={black_30}
-stickers_menuSelector={black.with_alpha(47)}
-switch2Track={rgba(255, 176, 173)}
-switch2TrackChecked={rgba(162, 206, 248)}
-switchThumb={white_70}
-switchThumbChecked={white_90}
-switchTrack={black_40}
-switchTrackBlue={black_40}
-switchTrackBlueChecked={rgba(119, 209, 255, 255)}
-switchTrackBlueSelector={rgba(185, 221, 250, 25)}
-switchTrackBlueSelectorChecked={rgba(140, 215, 255, 50)}
-switchTrackBlueThumb={black_10}
-switchTrackBlueThumbChecked={rgba(45, 130, 195, 255)}
-switchTrackChecked={white_80}
-undo_background={black_10}
-undo_cancelColor={rgba(108, 183, 255, 255)}
-voipgroup_topPanelGray={rgba(95, 115, 129, 255)}
-wallpaperFileOffset={white}
-windowBackgroundChecked={rgba(47, 118, 171, 255)}
-windowBackgroundCheckText={white}
-windowBackgroundGray={black}
-windowBackgroundGrayShadow={black}
-windowBackgroundUnchecked={black_10}
-windowBackgroundWhite={black}
-windowBackgroundWhiteBlackText={white_80}
-windowBackgroundWhiteBlueHeader={white}
-windowBackgroundWhiteBlueText={rgba(81, 154, 186)}
-windowBackgroundWhiteBlueText2={rgba(52, 139, 193)}
-windowBackgroundWhiteBlueText3={rgba(48, 121, 181)}
-windowBackgroundWhiteBlueText4={rgba(78, 146, 204)}
-windowBackgroundWhiteBlueText5={rgba(78, 146, 204)}
-windowBackgroundWhiteBlueText6={rgba(58, 140, 207)}
-windowBackgroundWhiteBlueText7={rgba(48, 121, 181)}
-windowBackgroundWhiteGrayIcon={gray}
-windowBackgroundWhiteGrayLine={white_80}
-windowBackgroundWhiteGrayText={white_60}
-windowBackgroundWhiteGrayText2={white_60}
-windowBackgroundWhiteGrayText3={black_40}
-windowBackgroundWhiteGrayText4={black_40}
-windowBackgroundWhiteGrayText5={white_70}
-windowBackgroundWhiteGrayText6={black_40}
-windowBackgroundWhiteGrayText7={white_80}
-windowBackgroundWhiteGrayText8={black_40}
-windowBackgroundWhiteGreenText={rgba(38, 151, 44)}
-windowBackgroundWhiteGreenText2={rgba(66, 195, 102)}
-windowBackgroundWhiteHintText={white_60}
-windowBackgroundWhiteInputField={white_80}
-windowBackgroundWhiteInputFieldActivated={rgba(55, 169, 240)}
-windowBackgroundWhiteLinkSelection={rgba(98, 169, 227, 51)}
-windowBackgroundWhiteLinkText={rgba(81, 154, 186)}
-windowBackgroundWhiteRedText={rgba(205, 90, 90)}
-windowBackgroundWhiteRedText2={rgba(218, 86, 77)}
-windowBackgroundWhiteRedText3={rgba(198, 73, 73)}
-windowBackgroundWhiteRedText4={rgba(219, 53, 53)}
-windowBackgroundWhiteRedText5={rgba(255, 72, 72)}
-windowBackgroundWhiteRedText6={rgba(255, 100, 100)}
-windowBackgroundWhiteValueText={rgba(81, 154, 186)}
-'''.strip()
-
-filename = 'true_black'
-if rgba.gen_debug:
-    filename += '_dbg'
-
-with open(f'{filename}.attheme', 'w') as f:
-    f.write(data)
-
-if not rgba.gen_debug:
-    rgba.print_warnings()
-
-print(rgba.usage_counter, 'colours')
\ No newline at end of file
+if __name__ == '__main__':
+    main(sys.argv)
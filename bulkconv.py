@@ -0,0 +1,94 @@
+# Vectorized attheme <-> atthex conversion, used by conv.py -b
+# The whole value column is converted with numpy in one go instead of one
+# int()/format() call per line. Values the vector path can't handle (too
+# long, 0x prefixes and other forms int() accepts) go through the scalar
+# converter in conv.py, so the output is the same as without -b.
+# Requires numpy.
+
+import numpy as np
+
+import conv
+import attheme
+
+HEX_DIGITS = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+HEX_VALUES = np.full(256, 255, dtype=np.uint8)
+HEX_VALUES[np.frombuffer(b'0123456789', dtype=np.uint8)] = np.arange(10)
+HEX_VALUES[np.frombuffer(b'abcdef', dtype=np.uint8)] = np.arange(10, 16)
+HEX_VALUES[np.frombuffer(b'ABCDEF', dtype=np.uint8)] = np.arange(10, 16)
+NIBBLE_SHIFTS = np.arange(28, -4, -4, dtype=np.uint32)
+
+
+def parse_ints(values):
+    # -> (int32 array, mask of values that didn't parse)
+    try:
+        ints = np.array(values, dtype=str).astype(np.int64)
+        bad = np.zeros(len(values), dtype=bool)
+    except (ValueError, OverflowError):
+        ints = np.zeros(len(values), dtype=np.int64)
+        bad = np.zeros(len(values), dtype=bool)
+        for i, v in enumerate(values):
+            try:
+                ints[i] = conv.to_signed_32bit(int(v))
+            except ValueError:
+                bad[i] = True
+    # wraps like the & 0xFFFFFFFF in conv.int_to_hex
+    return ints.astype(np.int32), bad
+
+
+def parse_hex(values):
+    # -> (int32 array, mask of values that didn't parse)
+    if not values:
+        # np.char.rjust can't size an empty column
+        return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=bool)
+    col = np.char.lstrip(np.array(values, dtype=str), '#')
+    lengths = np.char.str_len(col)
+    try:
+        raw = np.char.rjust(col, 8, '0').astype('S8')
+    except UnicodeEncodeError:
+        raw = np.array([v.encode('ascii', 'replace') for v in np.char.rjust(col, 8, '0')], dtype='S8')
+    digits = HEX_VALUES[raw.view(np.uint8).reshape(-1, 8)]
+    bad = (lengths == 0) | (lengths > 8) | (digits == 255).any(axis=1)
+    digits[bad] = 0
+    unsigned = (digits.astype(np.uint32) << NIBBLE_SHIFTS).sum(axis=1, dtype=np.uint32)
+    return unsigned.view(np.int32), bad
+
+
+def format_hex(ints):
+    # int32 array -> '#aarrggbb' strings
+    octets = ints.view(np.uint32).astype('>u4').view(np.uint8).reshape(-1, 4)
+    out = np.empty((len(ints), 9), dtype=np.uint8)
+    out[:, 0] = ord('#')
+    out[:, 1::2] = HEX_DIGITS[octets >> 4]
+    out[:, 2::2] = HEX_DIGITS[octets & 0xF]
+    return out.view('S9').ravel().astype(str)
+
+
+def convert(inpath, outpath, to_hex, log=print):
+    with attheme.reader(inpath) as src, attheme.writer(outpath) as dst:
+        records = list(src.records())
+        rows = [(i, value) for i, key, value in records if key is not None]
+        values = [value for _, value in rows]
+        if to_hex:
+            ints, bad = parse_ints(values)
+            out = format_hex(ints).tolist()
+            converter = conv.int_to_hex
+        else:
+            ints, bad = parse_hex(values)
+            out = ints.astype(str).tolist()
+            converter = conv.hex_to_int
+
+        for j in np.flatnonzero(bad):
+            try:
+                out[j] = str(converter(values[j]))
+            except Exception as e:
+                log('line {}: {}'.format(rows[j][0], e))
+                out[j] = values[j]
+
+        out = iter(out)
+        for i, key, value in records:
+            if key is None:
+                dst.write_line(value)
+            else:
+                dst.write(key, next(out))
+        if src.wallpaper is not None:
+            dst.write_wallpaper(src.wallpaper)
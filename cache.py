@@ -0,0 +1,89 @@
+# Content-addressed cache for build.py output
+# An entry remembers which spec digest produced a file, and the file's
+# size/mtime right after it was written. If both still match, the render
+# can be skipped entirely. If only the digest differs, the file is still the
+# one the entry describes, and build.py re-renders just the changed keys.
+
+import os
+import json
+import hashlib
+
+CACHE_PATH = '.build_cache.json'
+# bump when a change to the renderer would change the output of the same spec
+CACHE_VERSION = 1
+
+
+def spec_digest(spec, *extra):
+    h = hashlib.sha256(f'{CACHE_VERSION}\0'.encode())
+    h.update(spec.source().encode())
+    for e in extra:
+        h.update(f'\0{e}'.encode())
+    return h.hexdigest()
+
+
+def file_stamp(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def write_atomic(path, data):
+    if isinstance(data, str):
+        data = data.encode()
+    tmp = f'{path}.{os.getpid()}.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def write_if_changed(path, data):
+    # Leaves the file (and its mtime) alone if the bytes are the same
+    if isinstance(data, str):
+        data = data.encode()
+    try:
+        if os.path.getsize(path) == len(data):
+            with open(path, 'rb') as f:
+                if f.read() == data:
+                    return False
+    except FileNotFoundError:
+        pass
+    write_atomic(path, data)
+    return True
+
+
+class build_cache:
+    def __init__(self, path=CACHE_PATH):
+        self.path = path
+        self.dirty = False
+        try:
+            with open(path) as f:
+                self.entries = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.entries = {}
+
+    def lookup(self, out, digest):
+        entry = self.entries.get(out)
+        if entry is None or entry['digest'] != digest:
+            return None
+        if file_stamp(out) != entry['stamp']:
+            return None
+        return entry
+
+    def previous(self, out):
+        # the entry for out if out hasn't been touched since, whatever its digest
+        entry = self.entries.get(out)
+        if entry is None or file_stamp(out) != entry['stamp']:
+            return None
+        return entry
+
+    def store(self, out, digest, **info):
+        self.entries[out] = dict(info, digest=digest, stamp=file_stamp(out))
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        write_atomic(self.path, json.dumps(self.entries, indent=1))
+        self.dirty = False
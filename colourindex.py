@@ -0,0 +1,66 @@
+# Uniform grid over colour space for fixed-radius neighbour queries
+# With the cell size equal to the query radius, a point's neighbours can
+# only be in the 3^dims cells around it, so finding all close pairs is
+# roughly linear in the number of colours instead of quadratic.
+
+from math import ceil, dist
+from itertools import product
+from collections import defaultdict
+
+
+class grid_index:
+    def __init__(self, cell_size, dims=3):
+        self.cell_size = cell_size
+        self.dims = dims
+        self.cells = defaultdict(list)
+        self.points = []
+
+    def cell_of(self, p):
+        return tuple(int(c // self.cell_size) for c in p)
+
+    def add(self, p):
+        i = len(self.points)
+        self.points.append(p)
+        self.cells[self.cell_of(p)].append(i)
+        return i
+
+    def near(self, p, radius):
+        # indices of points within radius of p
+        reach = ceil(radius / self.cell_size)
+        cx = self.cell_of(p)
+        for offset in product(range(-reach, reach + 1), repeat=self.dims):
+            cell = self.cells.get(tuple(c + o for c, o in zip(cx, offset)))
+            if not cell:
+                continue
+            for i in cell:
+                if dist(p, self.points[i]) <= radius:
+                    yield i
+
+    def pairs(self, radius):
+        for i, p in enumerate(self.points):
+            for j in self.near(p, radius):
+                if j > i:
+                    yield i, j
+
+
+def clusters(points, radius):
+    # Groups of points linked by chains of neighbours closer than radius
+    index = grid_index(radius or 1, len(points[0]) if points else 3)
+    for p in points:
+        index.add(p)
+
+    parent = list(range(len(points)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in index.pairs(radius):
+        parent[find(i)] = find(j)
+
+    groups = defaultdict(list)
+    for i in range(len(points)):
+        groups[find(i)].append(i)
+    return [g for g in groups.values() if len(g) > 1]
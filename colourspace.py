@@ -0,0 +1,85 @@
+# Perceptual colour spaces for whole palettes at once
+# sRGB bytes are linearised through a 256 entry table, then converted to
+# OKLab or CIELAB (D65) with matrix products over the whole batch. Colours
+# can be given as packed (A)RGB ints or as (n, 3) arrays of 0-255 values.
+# Alpha is ignored. Requires numpy.
+
+import numpy as np
+
+
+def srgb_to_linear(c):
+    # c is in 0-255, not necessarily integral
+    c = np.asarray(c, dtype=np.float64) / 255
+    return np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+
+
+SRGB_TO_LINEAR = srgb_to_linear(np.arange(256))
+
+LINEAR_TO_LMS = np.array([
+    [0.4122214708, 0.5363325363, 0.0514459929],
+    [0.2119034982, 0.6806995451, 0.1073969566],
+    [0.0883024619, 0.2817188376, 0.6299787005],
+])
+LMS_TO_OKLAB = np.array([
+    [0.2104542553, 0.7936177850, -0.0040720468],
+    [1.9779984951, -2.4285922050, 0.4505937099],
+    [0.0259040371, 0.7827717662, -0.8086757660],
+])
+LINEAR_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+D65_WHITE = np.array([0.95047, 1.0, 1.08883])
+
+
+def as_rgb(colours):
+    arr = np.asarray(colours)
+    if arr.ndim >= 2 and arr.shape[-1] == 3:
+        return arr.astype(np.uint8)
+    arr = arr.astype(np.uint32)
+    return np.stack(((arr >> 16) & 0xFF, (arr >> 8) & 0xFF, arr & 0xFF), axis=-1).astype(np.uint8)
+
+
+def to_linear(colours):
+    return SRGB_TO_LINEAR[as_rgb(colours)]
+
+
+def to_oklab(colours):
+    lms = np.cbrt(to_linear(colours) @ LINEAR_TO_LMS.T)
+    return lms @ LMS_TO_OKLAB.T
+
+
+def to_lab(colours):
+    xyz = (to_linear(colours) @ LINEAR_TO_XYZ.T) / D65_WHITE
+    f = np.where(xyz > (6 / 29) ** 3, np.cbrt(xyz), xyz / (3 * (6 / 29) ** 2) + 4 / 29)
+    return np.stack((
+        116 * f[..., 1] - 16,
+        500 * (f[..., 0] - f[..., 1]),
+        200 * (f[..., 1] - f[..., 2]),
+    ), axis=-1)
+
+
+SPACES = {
+    'oklab': to_oklab,
+    'lab': to_lab,
+}
+
+
+def convert(colours, space='oklab'):
+    try:
+        return SPACES[space](colours)
+    except KeyError:
+        raise ValueError(f'Unknown colour space {space!r}, expected one of {list(SPACES)}') from None
+
+
+def delta_e(a, b, space='oklab'):
+    # Element-wise distance, in OKLab (deltaE OK) or CIELAB (deltaE 1976)
+    return np.linalg.norm(convert(a, space) - convert(b, space), axis=-1)
+
+
+def pairwise_delta_e(a, b=None, space='oklab'):
+    # (len(a), len(b)) matrix of distances, b defaults to a
+    a = convert(a, space)
+    b = a if b is None else convert(b, space)
+    return np.linalg.norm(a[:, None, :] - b[None, :, :], axis=-1)
@@ -0,0 +1,115 @@
+# Resolves translucent keys to the opaque colour they end up as on screen
+# Each translucent key is blended over its declared backdrop key(s). A
+# backdrop that is itself translucent is resolved first (over its own first
+# backdrop), so the work is done in dependency levels, each level being one
+# numpy blend over all of its pairs. Requires numpy.
+
+import re
+from collections import defaultdict
+
+import numpy as np
+
+# What a translucent key is drawn on, when its name doesn't say
+BACKDROPS = {
+    'actionBarDefaultSearchPlaceholder': ('actionBarDefault',),
+    'chat_linkSelectBackground': ('chat_inBubble', 'chat_outBubble'),
+    'chat_textSelectBackground': ('chat_inBubble', 'chat_outBubble'),
+    'chat_messagePanelHint': ('chat_messagePanelBackground',),
+    'key_sheet_other': ('dialogBackground',),
+    'listSelector': ('windowBackgroundWhite', 'windowBackgroundGray'),
+    'listSelectorSDK21': ('windowBackgroundWhite', 'windowBackgroundGray'),
+    'player_seekBarBackground': ('player_background',),
+}
+
+# (key prefix pattern, backdrops), first match wins
+BACKDROP_RULES = [
+    (r'chat_in', ('chat_inBubble',)),
+    (r'chat_out', ('chat_outBubble',)),
+    (r'chat_', ('chat_wallpaper',)),
+    (r'dialog', ('dialogBackground',)),
+    (r'actionBar', ('actionBarDefault',)),
+]
+BACKDROP_RULES = [(re.compile(prefix), backdrops) for prefix, backdrops in BACKDROP_RULES]
+DEFAULT_BACKDROPS = ('windowBackgroundWhite',)
+
+# What's under everything: an opaque black screen
+SCREEN = 0xFF000000
+
+
+def backdrops_for(key):
+    if key in BACKDROPS:
+        return BACKDROPS[key]
+    for prefix, backdrops in BACKDROP_RULES:
+        if prefix.match(key):
+            return backdrops
+    return DEFAULT_BACKDROPS
+
+
+def blend(fg, bg):
+    # fg (any alpha) over opaque bg, both arrays of packed ARGB
+    fg = np.asarray(fg, dtype=np.int64)
+    bg = np.asarray(bg, dtype=np.int64)
+    alpha = (fg >> 24) / 255
+    out = np.full(fg.shape, 0xFF000000, dtype=np.int64)
+    for shift in (16, 8, 0):
+        f = (fg >> shift) & 0xFF
+        b = (bg >> shift) & 0xFF
+        out |= np.rint(f * alpha + b * (1 - alpha)).astype(np.int64) << shift
+    return out
+
+
+def resolve(values):
+    # values: key -> ARGB. Returns [(key, backdrop, effective ARGB)] for every
+    # translucent key and each of its backdrops present in values.
+    effective = {k: v for k, v in values.items() if v >> 24 == 0xFF}
+    pending = []
+    for key, v in values.items():
+        if v >> 24 == 0xFF:
+            continue
+        backdrops = [b for b in backdrops_for(key) if b in values and b != key]
+        for i, backdrop in enumerate(backdrops):
+            pending.append((key, backdrop, i == 0))
+        if not backdrops:
+            pending.append((key, None, True))
+
+    resolved = []
+    while pending:
+        ready = [p for p in pending if p[1] is None or p[1] in effective]
+        if not ready:
+            # backdrops that only lead back to each other sit on the screen
+            ready = [(key, None, first) for key, _, first in pending]
+            pending = []
+        else:
+            pending = [p for p in pending if not (p[1] is None or p[1] in effective)]
+
+        fg = [values[key] for key, _, _ in ready]
+        bg = [SCREEN if b is None else effective[b] for _, b, _ in ready]
+        for (key, backdrop, first), out in zip(ready, blend(fg, bg).tolist()):
+            resolved.append((key, backdrop, out))
+            if first:
+                effective[key] = out
+    return resolved
+
+
+def collisions(values):
+    # Yields warnings for translucent keys that vanish into their backdrop,
+    # and for different translucent keys that end up the same colour on it
+    resolved = resolve(values)
+    effective = {k: v for k, v in values.items() if v >> 24 == 0xFF}
+    for key, _, out in resolved:
+        effective.setdefault(key, out)
+
+    same = defaultdict(list)
+    for key, backdrop, out in resolved:
+        if values[key] >> 24 == 0:
+            # fully transparent keys are meant to be invisible
+            continue
+        if backdrop is not None and out == effective[backdrop]:
+            yield f'{key} is invisible over {backdrop}'
+            continue
+        same[backdrop, out].append(key)
+
+    for (backdrop, out), keys in same.items():
+        if len(keys) > 1 and len({values[k] for k in keys}) > 1:
+            rgb = ((out >> 16) & 0xFF, (out >> 8) & 0xFF, out & 0xFF)
+            yield f'{", ".join(keys)} all look like rgba{rgb} over {backdrop or "the screen"}'
@@ -0,0 +1,138 @@
+# WCAG 2 contrast audit of text/icon keys against the surface they sit on
+# Usage: python contrast.py [themes, dirs or globs...]
+# With no arguments the spec in build.py is audited. Exits with 1 if any
+# pair is below its minimum ratio. Requires numpy.
+
+import re
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+import attheme
+import colourspace
+
+TEXT = 4.5
+NON_TEXT = 3.0
+
+# (foreground key pattern, background key, minimum ratio), first match wins
+RULES = [
+    (r'windowBackgroundWhite\w*(Text|Hint)\w*', 'windowBackgroundWhite', TEXT),
+    (r'windowBackgroundWhite\w*Icon\w*', 'windowBackgroundWhite', NON_TEXT),
+    (r'windowBackgroundGray\w*Text\w*', 'windowBackgroundGray', TEXT),
+    (r'actionBarDefault(Title|SubTitle|SearchPlaceholder)', 'actionBarDefault', TEXT),
+    (r'actionBarDefaultIcon', 'actionBarDefault', NON_TEXT),
+    (r'actionBarDefaultSubmenuItem', 'actionBarDefaultSubmenuBackground', TEXT),
+    (r'actionBarDefaultSubmenuItemIcon', 'actionBarDefaultSubmenuBackground', NON_TEXT),
+    (r'chats_menu(Name|Phone|ItemText)\w*', 'chats_menuBackground', TEXT),
+    (r'chats_(name|message|date|actionMessage|attachMessage|draft|secretName)\w*', 'windowBackgroundWhite', TEXT),
+    (r'chats_\w*Icon', 'windowBackgroundWhite', NON_TEXT),
+    (r'chat_messageTextIn', 'chat_inBubble', TEXT),
+    (r'chat_messageTextOut', 'chat_outBubble', TEXT),
+    (r'chat_in\w*Selected\w*Text', 'chat_inBubbleSelected', TEXT),
+    (r'chat_out\w*Selected\w*Text', 'chat_outBubbleSelected', TEXT),
+    (r'chat_in\w*(Text|Name)\w*', 'chat_inBubble', TEXT),
+    (r'chat_out\w*(Text|Name)\w*', 'chat_outBubble', TEXT),
+    (r'chat_in\w*Icon\w*', 'chat_inBubble', NON_TEXT),
+    (r'chat_out\w*Icon\w*', 'chat_outBubble', NON_TEXT),
+    (r'chat_messagePanel(Text|Hint)', 'chat_messagePanelBackground', TEXT),
+    (r'chat_messagePanelIcons', 'chat_messagePanelBackground', NON_TEXT),
+    (r'chat_emojiPanel\w*(Text|Name)\w*', 'chat_emojiPanelBackground', TEXT),
+    (r'chat_emojiPanel\w*Icon\w*', 'chat_emojiPanelBackground', NON_TEXT),
+    (r'chat_service(Text|Link)', 'chat_serviceBackground', TEXT),
+    (r'chat_serviceIcon', 'chat_serviceBackground', NON_TEXT),
+    (r'dialog(Text\w*|SearchText|SearchHint)', 'dialogBackground', TEXT),
+    (r'dialog\w*Icon', 'dialogBackground', NON_TEXT),
+]
+RULES = [(re.compile(fg), bg, ratio) for fg, bg, ratio in RULES]
+
+# Icons drawn on their own circle, e.g. chat_inFileSelectedIcon sits on
+# chat_inFileBackgroundSelected rather than on the bubble
+SIBLING_ICON = re.compile(r'^(\w+?)(Selected)?Icon$')
+
+# Keys that match a rule by name but aren't drawn as text or icons
+NOT_FOREGROUND = re.compile(r'Background|Selector|Selection|Highlight|Line|Shadow|Progress|Cursor')
+
+LUMINANCE = np.array([0.2126, 0.7152, 0.0722])
+
+
+@lru_cache(maxsize=16)
+def pair_keys(keys):
+    # keys is a tuple so every variant sharing a key list pairs only once
+    present = set(keys)
+    pairs = []
+    for key in keys:
+        if NOT_FOREGROUND.search(key):
+            continue
+        match = SIBLING_ICON.match(key)
+        if match:
+            bg = f'{match[1]}Background{match[2] or ""}'
+            if bg in present:
+                pairs.append((key, bg, NON_TEXT))
+                continue
+        for fg, bg, ratio in RULES:
+            if fg.fullmatch(key):
+                if bg in present and bg != key:
+                    pairs.append((key, bg, ratio))
+                break
+    return pairs
+
+
+def split_argb(values):
+    values = np.asarray(values, dtype=np.int64) & 0xFFFFFFFF
+    rgb = np.stack(((values >> 16) & 0xFF, (values >> 8) & 0xFF, values & 0xFF), axis=-1)
+    return rgb.astype(np.float64), (values >> 24) / 255
+
+
+def relative_luminance(rgb):
+    return colourspace.srgb_to_linear(rgb) @ LUMINANCE
+
+
+def contrast_ratios(fg, bg):
+    # fg may be translucent and is blended over bg; bg is taken as opaque
+    fg_rgb, fg_alpha = split_argb(fg)
+    bg_rgb, _ = split_argb(bg)
+    blended = fg_rgb * fg_alpha[:, None] + bg_rgb * (1 - fg_alpha[:, None])
+    l1 = relative_luminance(blended)
+    l2 = relative_luminance(bg_rgb)
+    return (np.maximum(l1, l2) + 0.05) / (np.minimum(l1, l2) + 0.05)
+
+
+def audit(values):
+    # values: key -> ARGB. Returns [(fg, bg, ratio, minimum)] for failing pairs
+    pairs = pair_keys(tuple(values))
+    if not pairs:
+        return []
+    fg = [values[k] for k, _, _ in pairs]
+    bg = [values[k] for _, k, _ in pairs]
+    minimum = np.array([r for _, _, r in pairs])
+    ratios = contrast_ratios(fg, bg)
+    failing = np.flatnonzero(ratios < minimum)
+    failing = failing[np.argsort(ratios[failing])]
+    return [(pairs[i][0], pairs[i][1], float(ratios[i]), float(minimum[i])) for i in failing]
+
+
+def print_failures(failures):
+    for fg, bg, ratio, minimum in failures:
+        print(f'Contrast: {fg} on {bg} is {ratio:.2f}:1, needs {minimum:g}:1')
+    print(f'{len(failures)} contrast failure(s)')
+
+
+def main(argv):
+    failed = 0
+    if len(argv) < 2:
+        import build
+        failures = audit(build.true_black.resolved_keys())
+        print_failures(failures)
+        return 1 if failures else 0
+
+    for path in attheme.expand_paths(argv[1:]):
+        failures = audit(attheme.load_values(path))
+        print(f'{path}:')
+        print_failures(failures)
+        failed += bool(failures)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -1,11 +1,18 @@
-# usage python theme_conv.py file.[atthex|attheme]
+# usage python conv.py [-b] file.[atthex|attheme]
+#       python conv.py [-b] [-j N] -t attheme|atthex <files, dirs or globs...>
+#       python conv.py -t attheme|atthex -l < list_of_files.txt
+#       python conv.py -p atthex < theme.attheme > theme.atthex
+# -b converts all values in one vectorized pass (needs numpy)
+# Batches only convert towards -t, so a directory holding both a.attheme and
+# a.atthex never has the two overwrite each other.
 
+import os
 import sys
+import argparse
 from os import path
-import re
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 
-
-RE_LINE = re.compile(r'^(\w+)=(.+)$')
+import attheme
 
 
 def int_to_hex(x):
@@ -23,38 +30,166 @@ def hex_to_int(x):
     return to_signed_32bit(int(x, 16))
 
 
-def do_thing(inpath, outpath, converter):
-    lines = []
-    with open(inpath) as f:
-        for i, line in enumerate(f, 1):
-            line = line.strip()
-            match = RE_LINE.match(line)
-            if match:
-                try:
-                    line = '{}={}'.format(
-                        match.group(1),
-                        converter(match.group(2))
-                    )
-                except Exception as e:
-                    print('line {}: {}'.format(i, e))
-            lines.append(line)
+TARGETS = {
+    '.attheme': ('.atthex', int_to_hex),
+    '.atthex': ('.attheme', hex_to_int)
+}
+
+
+def convert_records(records, dst, converter, log=print):
+    for i, key, value in records:
+        if key is None:
+            dst.write_line(value)
+            continue
+        try:
+            value = converter(value)
+        except Exception as e:
+            log('line {}: {}'.format(i, e))
+        dst.write(key, value)
+
+
+def do_thing(inpath, outpath, converter, log=print):
+    with attheme.reader(inpath) as src, attheme.writer(outpath) as dst:
+        convert_records(src.records(), dst, converter, log)
+        if src.wallpaper is not None:
+            dst.write_wallpaper(src.wallpaper)
 
-    with open(outpath, 'w') as f:
-        f.write('\n'.join(lines))
 
+def do_pipe(src, dst, converter, log=print):
+    src = attheme.stream_reader(src)
+    with attheme.writer(file=dst) as dst:
+        convert_records(src.records(), dst, converter, log)
+        if src.has_wallpaper:
+            dst.write_raw_wallpaper(src.wallpaper_chunks())
 
-try:
-    if len(sys.argv) != 2:
-        raise RuntimeError('expected single arguement')
-    filepath, ext = path.splitext(sys.argv[1])
-    newext, converter = {
-        '.attheme': ('.atthex', int_to_hex),
-        '.atthex': ('.attheme', hex_to_int)
-    }.get(ext, (None, None))
+
+def get_target(filepath):
+    filepath, ext = path.splitext(filepath)
+    newext, converter = TARGETS.get(ext, (None, None))
     if not newext:
         raise RuntimeError('what is this file i dont even')
-    do_thing(sys.argv[1], filepath + newext, converter)
-except RuntimeError as e:
-    print('Error:', e)
-    print('usage python {} file.[atthex|attheme]'.format(sys.argv[0]))
-    exit()
\ No newline at end of file
+    return filepath + newext, converter
+
+
+def convert_file(inpath, bulk=False):
+    # Runs in the batch workers, so messages are returned instead of printed
+    messages = []
+    outpath, converter = get_target(inpath)
+    if bulk:
+        import bulkconv
+        bulkconv.convert(inpath, outpath, converter is int_to_hex, messages.append)
+    else:
+        do_thing(inpath, outpath, converter, messages.append)
+    return outpath, messages
+
+
+def batch_inputs(paths, to):
+    # -> (path, whether to convert it) for each distinct path. Only files of
+    # the source format qualify, so no input is another input's output
+    source = '.atthex' if to == 'attheme' else '.attheme'
+    seen = set()
+    for p in paths:
+        real = path.realpath(p)
+        if real in seen:
+            continue
+        seen.add(real)
+        yield p, path.splitext(p)[1] == source
+
+
+def convert_batch(inpaths, bulk=False, jobs=None, max_pending=None):
+    # Yields (inpath, outpath, messages, error) in completion order while
+    # keeping at most max_pending files in flight
+    jobs = jobs or os.cpu_count()
+    max_pending = max_pending or jobs * 2
+    inpaths = iter(inpaths)
+    with ProcessPoolExecutor(jobs) as ex:
+        pending = {}
+        while True:
+            for inpath in inpaths:
+                pending[ex.submit(convert_file, inpath, bulk)] = inpath
+                if len(pending) >= max_pending:
+                    break
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                inpath = pending.pop(future)
+                try:
+                    outpath, messages = future.result()
+                except Exception as e:
+                    yield inpath, None, [], e
+                else:
+                    yield inpath, outpath, messages, None
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(
+        prog=argv[0],
+        description='Converts between .attheme (signed ints) and .atthex (hex)'
+    )
+    parser.add_argument('paths', nargs='*', help='files, directories or globs')
+    parser.add_argument('-b', '--bulk', action='store_true',
+                        help='convert all values in one vectorized pass (needs numpy)')
+    parser.add_argument('-l', '--list', action='store_true',
+                        help='read paths to convert from stdin, one per line')
+    parser.add_argument('-p', '--pipe', choices=('attheme', 'atthex'),
+                        help='convert stdin to the given format on stdout')
+    parser.add_argument('-t', '--to', choices=('attheme', 'atthex'),
+                        help='format to convert to, required for more than one file')
+    parser.add_argument('-j', '--jobs', type=int, default=None)
+    args = parser.parse_args(argv[1:])
+
+    if args.pipe:
+        converter = TARGETS['.' + ('atthex' if args.pipe == 'attheme' else 'attheme')][1]
+        do_pipe(sys.stdin.buffer, sys.stdout.buffer, converter,
+                lambda msg: print(msg, file=sys.stderr))
+        return 0
+
+    patterns = list(args.paths)
+    if args.list:
+        patterns += [line.strip() for line in sys.stdin if line.strip()]
+    if not patterns:
+        parser.error('expected at least one file')
+
+    # a single file keeps the old, pool-less behaviour
+    if len(patterns) == 1 and path.isfile(patterns[0]):
+        try:
+            if args.to and not get_target(patterns[0])[0].endswith('.' + args.to):
+                raise RuntimeError('{} is already a .{}'.format(patterns[0], args.to))
+            outpath, messages = convert_file(patterns[0], args.bulk)
+        except RuntimeError as e:
+            print('Error:', e)
+            return 1
+        for msg in messages:
+            print(msg)
+        return 0
+
+    if not args.to:
+        parser.error('-t/--to is required for directories, globs and several files')
+
+    inpaths = []
+    skipped = 0
+    for inpath, ok in batch_inputs(attheme.expand_paths(patterns), args.to):
+        if ok:
+            inpaths.append(inpath)
+        else:
+            skipped += 1
+    if skipped:
+        print('{} file(s) skipped, not converting to .{}'.format(skipped, args.to))
+
+    failed = 0
+    for inpath, outpath, messages, error in convert_batch(inpaths, args.bulk, args.jobs):
+        if error is not None:
+            failed += 1
+            print('{}: Error: {}'.format(inpath, error))
+            continue
+        print('{} -> {}'.format(inpath, outpath))
+        for msg in messages:
+            print('  {}'.format(msg))
+    if failed:
+        print('{} file(s) failed'.format(failed))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
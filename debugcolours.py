@@ -0,0 +1,114 @@
+# Reproducible debug colours: every key gets an opaque colour picked by
+# hashing its name into a table of well separated colours, so the same key
+# is the same colour on every build and a screenshot can be decoded with
+# the legend. The table is a farthest point sequence in CIELAB over a grid
+# of sRGB colours; any prefix of it is spread as evenly as the sequence
+# allows. It's computed once and cached next to the build.
+# Usage: python debugcolours.py <legend.json> <#rrggbb...> looks colours up.
+# Requires numpy.
+
+import sys
+import json
+import hashlib
+
+import numpy as np
+
+import colourspace
+from cache import write_atomic
+
+TABLE_PATH = '.debug_colours.json'
+TABLE_SPACE = 'lab'
+# levels per channel of the candidate grid
+GRID = 32
+
+
+def farthest_points(points, n, start):
+    # indices of n points, each the farthest from all earlier ones
+    # (squared distances, the order is the same)
+    picked = [start]
+    nearest = ((points - points[start]) ** 2).sum(axis=1)
+    for _ in range(n - 1):
+        i = int(nearest.argmax())
+        picked.append(i)
+        np.minimum(nearest, ((points - points[i]) ** 2).sum(axis=1), out=nearest)
+    return picked
+
+
+def distinct_colours(n):
+    levels = np.linspace(0, 255, GRID).round().astype(np.int64)
+    r, g, b = np.meshgrid(levels, levels, levels, indexing='ij')
+    rgb = (r.ravel() << 16) | (g.ravel() << 8) | b.ravel()
+    points = colourspace.convert(rgb, TABLE_SPACE)
+    # start from the colour farthest from the middle of the gamut
+    start = int(np.linalg.norm(points - points.mean(axis=0), axis=1).argmax())
+    return [0xFF000000 | int(rgb[i]) for i in farthest_points(points, n, start)]
+
+
+def colour_table(n, path=TABLE_PATH):
+    # First n colours of the sequence, from the cache file when it is long enough
+    params = {'space': TABLE_SPACE, 'grid': GRID}
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+        if cached['params'] == params and len(cached['colours']) >= n:
+            return cached['colours'][:n]
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+    colours = distinct_colours(n)
+    write_atomic(path, json.dumps({'params': params, 'colours': colours}))
+    return colours
+
+
+def table_size(keys):
+    # a power of two, so adding or removing a few keys rarely moves the others
+    return 1 << max(len(keys) - 1, 0).bit_length()
+
+
+def key_slot(key, seed, size):
+    h = hashlib.blake2b(f'{seed}\0{key}'.encode(), digest_size=8).digest()
+    return int.from_bytes(h, 'little') % size
+
+
+def assign(keys, seed=0, path=TABLE_PATH):
+    # key -> ARGB, no two keys share a colour (collisions probe the next slot)
+    size = table_size(keys)
+    table = colour_table(size, path)
+    taken = set()
+    colours = {}
+    for key in keys:
+        slot = key_slot(key, seed, size)
+        while slot in taken:
+            slot = (slot + 1) % size
+        taken.add(slot)
+        colours[key] = table[slot]
+    return colours
+
+
+def legend(colours):
+    # '#rrggbb' -> key, what a colour picker on a screenshot reports
+    return {f'#{argb & 0xFFFFFF:06x}': key for key, argb in colours.items()}
+
+
+def lookup(legend, rgb):
+    # Key whose debug colour is closest to rgb, with the deltaE, for
+    # screenshots whose colours went through scaling or compression
+    names = list(legend)
+    values = [int(name[1:], 16) for name in names]
+    d = colourspace.delta_e(np.full(len(values), rgb), values, TABLE_SPACE)
+    i = int(d.argmin())
+    return legend[names[i]], float(d[i])
+
+
+def main(argv):
+    if len(argv) < 3:
+        print(f'Usage: {argv[0]} <legend.json> <#rrggbb...>')
+        sys.exit(1)
+    with open(argv[1]) as f:
+        entries = json.load(f)
+    for colour in argv[2:]:
+        key, d = lookup(entries, int(colour.lstrip('#'), 16))
+        print(f'{colour} {key} (deltaE {d:.1f})')
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,229 @@
+# Exports one spec to every client we ship True Black for
+# Usage: python build.py export [-t attheme,atthex,tdesktop,tgx] [-o outdir] [-s spec.py] [-j jobs]
+# The key table (Android key -> ARGB) and the palette are resolved once in
+# the parent and shared with one worker per format. Clients other than
+# Android get their keys from the mapping tables below: one client key per
+# line, set to an Android key or palette colour in the same expression
+# syntax as the spec (name or name.with_alpha(n)).
+
+import io
+import os
+import sys
+import zipfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from build import colour_expr, parse_entries, to_signed_32bit, true_black
+from cache import write_if_changed
+
+TDESKTOP_KEYS = '''
+windowBg=windowBackgroundWhite
+windowFg=windowBackgroundWhiteBlackText
+windowBgOver=windowBackgroundGray
+windowBgRipple=listSelectorSDK21
+windowSubTextFg=windowBackgroundWhiteGrayText
+windowActiveTextFg=windowBackgroundWhiteBlueText
+windowBoldFg=windowBackgroundWhiteBlackText
+attentionButtonFg=windowBackgroundWhiteRedText
+activeButtonBg=chats_actionBackground
+activeButtonFg=chats_actionIcon
+lightButtonFg=windowBackgroundWhiteBlueText
+titleBg=actionBarDefault
+titleFg=actionBarDefaultTitle
+menuBg=actionBarDefaultSubmenuBackground
+menuIconFg=actionBarDefaultSubmenuItemIcon
+scrollBarBg=white.with_alpha(83)
+placeholderFg=windowBackgroundWhiteHintText
+inputBorderFg=windowBackgroundWhiteInputField
+activeLineFg=windowBackgroundWhiteInputFieldActivated
+checkboxFg=checkboxSquareBackground
+boxBg=dialogBackground
+boxTextFg=dialogTextBlack
+boxTitleFg=dialogTextBlack
+mainMenuBg=chats_menuBackground
+mainMenuCoverBg=chats_menuTopBackgroundCats
+mainMenuCoverFg=chats_menuName
+dialogsBg=windowBackgroundWhite
+dialogsNameFg=chats_name
+dialogsTextFg=chats_message
+dialogsDateFg=chats_date
+dialogsDraftFg=chats_draft
+dialogsSentIconFg=chats_sentCheck
+dialogsUnreadBg=chats_unreadCounter
+dialogsUnreadBgMuted=chats_unreadCounterMuted
+dialogsUnreadFg=chats_unreadCounterText
+dialogsVerifiedIconBg=chats_verifiedBackground
+dialogsVerifiedIconFg=chats_verifiedCheck
+msgInBg=chat_inBubble
+msgInBgSelected=chat_inBubbleSelected
+msgInShadow=chat_inBubbleShadow
+msgInDateFg=chat_inTimeText
+msgInReplyBarColor=chat_inReplyLine
+msgOutBg=chat_outBubble
+msgOutBgSelected=chat_outBubbleSelected
+msgOutShadow=chat_outBubbleShadow
+msgOutDateFg=chat_outTimeText
+msgOutReplyBarColor=chat_outReplyLine
+msgServiceBg=chat_serviceBackground
+msgServiceFg=chat_serviceText
+historyTextInFg=chat_messageTextIn
+historyTextOutFg=chat_messageTextOut
+historyLinkInFg=chat_messageLinkIn
+historyLinkOutFg=chat_messageLinkOut
+historyOutIconFg=chat_outSentCheck
+historyComposeAreaBg=chat_messagePanelBackground
+historyComposeAreaFg=chat_messagePanelText
+historyComposeIconFg=chat_messagePanelIcons
+historySendIconFg=chat_messagePanelSend
+historyToDownBg=chat_goDownButton
+historyToDownFg=chat_goDownButtonIcon
+emojiPanBg=chat_emojiPanelBackground
+'''
+
+TGX_KEYS = '''
+filling=windowBackgroundWhite
+background=windowBackgroundGray
+separator=divider
+fillingPressed=listSelectorSDK21
+text=windowBackgroundWhiteBlackText
+textLight=windowBackgroundWhiteGrayText
+textNeutral=windowBackgroundWhiteBlueText
+textLink=windowBackgroundWhiteLinkText
+textNegative=windowBackgroundWhiteRedText
+textPlaceholder=windowBackgroundWhiteHintText
+headerBackground=actionBarDefault
+headerText=actionBarDefaultTitle
+headerIcon=actionBarDefaultIcon
+icon=windowBackgroundWhiteGrayIcon
+progress=progressCircle
+controlActive=radioBackgroundChecked
+inputActive=windowBackgroundWhiteInputFieldActivated
+inputInactive=windowBackgroundWhiteInputField
+online=chats_onlineCircle
+badge=chats_unreadCounter
+badgeText=chats_unreadCounterText
+badgeMuted=chats_unreadCounterMuted
+chatListVerify=chats_verifiedBackground
+chatSendButton=chat_messagePanelSend
+bubbleIn_background=chat_inBubble
+bubbleIn_text=chat_messageTextIn
+bubbleIn_time=chat_inTimeText
+bubbleOut_background=chat_outBubble
+bubbleOut_text=chat_messageTextOut
+bubbleOut_time=chat_outTimeText
+ticks=chat_outSentCheck
+ticksRead=chat_outSentCheckRead
+'''
+
+THEME_NAME = 'True Black'
+
+
+def map_keys(mapping, values, palette):
+    # client key -> ARGB, Android keys are looked up before palette names
+    rows = {}
+    for key, e in mapping.items():
+        base = values.get(e.base, palette.get(e.base))
+        if base is None:
+            raise NameError(f'{key}: {e.base} is neither a key nor in the palette')
+        if e.alpha is not None:
+            base = (base & 0xFFFFFF) | (e.alpha << 24)
+        rows[key] = base
+    return rows
+
+
+def css_hex(argb):
+    # #rrggbb, or #rrggbbaa when translucent
+    if argb >> 24 == 0xFF:
+        return f'#{argb & 0xFFFFFF:06x}'
+    return f'#{argb & 0xFFFFFF:06x}{argb >> 24:02x}'
+
+
+def format_attheme(rows):
+    return '\n'.join(f'{key}={to_signed_32bit(argb)}' for key, argb in rows.items())
+
+
+def format_atthex(rows):
+    return '\n'.join(f'{key}=#{argb:08x}' for key, argb in rows.items())
+
+
+def format_tdesktop(rows):
+    # a zip holding colors.tdesktop-theme, with a fixed timestamp so that
+    # the same colours always give the same bytes
+    colours = ''.join(f'{key}: {css_hex(argb)};\n' for key, argb in rows.items())
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as z:
+        z.writestr(zipfile.ZipInfo('colors.tdesktop-theme'), colours)
+    return buf.getvalue()
+
+
+def format_tgx(rows):
+    # keys sharing a colour go on one line, like Telegram X writes them
+    by_colour = {}
+    for key, argb in rows.items():
+        by_colour.setdefault(argb, []).append(key)
+    lines = ['!', f'name: "{THEME_NAME}"', '@', 'dark: 1', '#']
+    lines.extend(f'{", ".join(keys)}: {css_hex(argb)}' for argb, keys in by_colour.items())
+    return '\n'.join(lines) + '\n'
+
+
+# name -> (file extension, mapping table or None for Android keys as they are, formatter)
+EXPORTERS = {
+    'attheme': ('.attheme', None, format_attheme),
+    'atthex': ('.atthex', None, format_atthex),
+    'tdesktop': ('.tdesktop-theme', TDESKTOP_KEYS, format_tdesktop),
+    'tgx': ('.tgx-theme', TGX_KEYS, format_tgx),
+}
+
+
+# The resolved spec, set once per worker by _export_init
+_tables = None
+
+
+def _export_init(values, palette):
+    global _tables
+    _tables = (values, palette)
+
+
+def _export(job):
+    name, path = job
+    values, palette = _tables
+    _, mapping, formatter = EXPORTERS[name]
+    rows = values if mapping is None else map_keys(parse_entries(mapping), values, palette)
+    write_if_changed(path, formatter(rows))
+    return name, path, len(rows)
+
+
+def export(spec, targets, outdir='.', prefix='true_black', jobs=None):
+    values = spec.resolved_keys()
+    palette = {name: spec.resolve(colour_expr(name, None)) for name in spec.palette}
+    os.makedirs(outdir, exist_ok=True)
+    job_list = [(name, os.path.join(outdir, prefix + EXPORTERS[name][0])) for name in targets]
+    with ProcessPoolExecutor(jobs, initializer=_export_init, initargs=(values, palette)) as ex:
+        return list(ex.map(_export, job_list))
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='build.py export')
+    parser.add_argument('-t', '--targets', default=','.join(EXPORTERS),
+                        help=f'comma separated, any of {", ".join(EXPORTERS)}')
+    parser.add_argument('-o', '--outdir', default='.')
+    parser.add_argument('-p', '--prefix', default='true_black', help='output file name without extension')
+    parser.add_argument('-s', '--spec', help='file with PALETTE and KEYS blocks instead of True Black')
+    parser.add_argument('-j', '--jobs', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    targets = args.targets.split(',')
+    for name in targets:
+        if name not in EXPORTERS:
+            parser.error(f'unknown target {name}')
+    spec = true_black
+    if args.spec:
+        import watch
+        spec = watch.load_spec(args.spec)
+
+    for name, path, count in export(spec, targets, args.outdir, args.prefix, args.jobs):
+        print(f'{name}: {path} ({count} keys)')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
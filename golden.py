@@ -0,0 +1,209 @@
+# Readable regression diff between two sets of generated themes
+# Usage: python golden.py [-e key-glob ...] [-t deltaE] [-j report.json] <old> <new>
+#        python golden.py -r <git rev> [options] <files or dirs...>
+#        python golden.py --textconv <theme>
+# old and new are theme files or directories of them (a release's
+# variants/, say), matched by file name. With -r each path is compared with
+# the same path at that git revision. Changed keys are listed as #aarrggbb
+# with their CIELAB deltaE, grouped by the palette entry the spec builds
+# them from. The exit status is 1 if any key was added, removed or changed
+# by more than -t without matching an -e pattern, so it works as a check.
+# For readable `git diff`s of themes:
+#   git config diff.attheme.textconv 'python golden.py --textconv'
+#   echo '*.attheme diff=attheme' >> .git/info/attributes
+# Requires numpy.
+
+import os
+import sys
+import json
+import fnmatch
+import argparse
+import subprocess
+from collections import defaultdict
+
+import numpy as np
+
+import attheme
+import colourspace
+from build import true_black, colour_expr
+
+SPACE = 'lab'
+
+
+def parse_values(data):
+    # key -> ARGB from the bytes of a theme, like attheme.load_values
+    keys_end, _ = attheme.split_wallpaper(data)
+    values = {}
+    for line in data[:keys_end].decode().split('\n'):
+        match = attheme.RE_LINE.match(line.strip())
+        if match:
+            values[match[1]] = attheme.parse_value(match[2])
+    return values
+
+
+def git_show(rev, path):
+    # None if the file doesn't exist at rev
+    result = subprocess.run(['git', 'show', f'{rev}:./{path}'], capture_output=True)
+    return result.stdout if result.returncode == 0 else None
+
+
+def git_files(rev, directory):
+    result = subprocess.run(
+        ['git', 'ls-tree', '-r', '--name-only', rev, '--', directory],
+        capture_output=True, text=True, check=True
+    )
+    return [p for p in result.stdout.split('\n') if os.path.splitext(p)[1] in attheme.EXTENSIONS]
+
+
+def pairs_from_paths(old, new):
+    # (name, old path or None, new path or None) for files or matching directories
+    if not os.path.isdir(old) and not os.path.isdir(new):
+        return [(new, old, new)]
+    def names(d):
+        return {os.path.relpath(p, d): p for p in attheme.expand_paths([d])} if os.path.isdir(d) else {}
+    old_files, new_files = names(old), names(new)
+    return [
+        (name, old_files.get(name), new_files.get(name))
+        for name in sorted(old_files.keys() | new_files.keys())
+    ]
+
+
+def palette_groups(spec):
+    # key -> name of the palette entry (or rgba literal) it is built from
+    return {
+        key: e.base if isinstance(e.base, str) else str(colour_expr(e.base, None))
+        for key, e in spec.keys.items()
+    }
+
+
+def compare(old, new, groups, expect=(), tolerance=0.0):
+    # old, new: key -> ARGB. Returns a report dict; 'unexpected' counts the
+    # differences not covered by expect patterns or the tolerance
+    keys = list(old.keys() | new.keys())
+    keys.sort()
+    index = {key: i for i, key in enumerate(keys)}
+    a = np.zeros(len(keys), dtype=np.int64)
+    b = np.zeros(len(keys), dtype=np.int64)
+    in_a = np.zeros(len(keys), dtype=bool)
+    in_b = np.zeros(len(keys), dtype=bool)
+    for key, v in old.items():
+        a[index[key]] = v
+        in_a[index[key]] = True
+    for key, v in new.items():
+        b[index[key]] = v
+        in_b[index[key]] = True
+
+    changed = np.flatnonzero(in_a & in_b & (a != b))
+    delta = colourspace.delta_e(a[changed], b[changed], SPACE) if len(changed) else np.zeros(0)
+
+    def expected(key):
+        return any(fnmatch.fnmatchcase(key, p) for p in expect)
+
+    report = {
+        'added': [keys[i] for i in np.flatnonzero(in_b & ~in_a)],
+        'removed': [keys[i] for i in np.flatnonzero(in_a & ~in_b)],
+        'changed': defaultdict(list),
+        'unexpected': 0,
+    }
+    report['unexpected'] += sum(not expected(k) for k in report['added'] + report['removed'])
+    for i, d in zip(changed.tolist(), delta.tolist()):
+        key = keys[i]
+        alpha_changed = (a[i] >> 24) != (b[i] >> 24)
+        ok = expected(key) or (d <= tolerance and not alpha_changed)
+        report['changed'][groups.get(key, '?')].append({
+            'key': key,
+            'old': f'#{int(a[i]):08x}',
+            'new': f'#{int(b[i]):08x}',
+            'delta_e': round(d, 2),
+            'expected': ok,
+        })
+        report['unexpected'] += not ok
+    report['changed'] = dict(sorted(report['changed'].items()))
+    return report
+
+
+def print_report(name, report, expect=()):
+    print(f'{name}: {report["unexpected"]} unexpected difference(s)')
+    for sign, change in (('+', 'added'), ('-', 'removed')):
+        for key in report[change]:
+            mark = ' ' if any(fnmatch.fnmatchcase(key, p) for p in expect) else '!'
+            print(f'   {mark} {sign} {key}')
+    for group, changes in report['changed'].items():
+        print(f'  {group} ({len(changes)} key(s))')
+        for c in changes:
+            mark = ' ' if c['expected'] else '!'
+            print(f'   {mark} {c["key"]:45} {c["old"]} -> {c["new"]}  deltaE {c["delta_e"]:.2f}')
+
+
+def textconv(path):
+    for key, argb in attheme.load_values(path).items():
+        print(f'{key}=#{argb:08x}')
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog=argv[0])
+    parser.add_argument('paths', nargs='+', help='old and new, or the paths to check with -r')
+    parser.add_argument('-r', '--rev', help='compare paths against this git revision')
+    parser.add_argument('-e', '--expect', action='append', default=[],
+                        help='glob of keys that are allowed to change, can be repeated')
+    parser.add_argument('-t', '--tolerance', type=float, default=0.0,
+                        help='changes up to this deltaE (same alpha) are not reported as unexpected')
+    parser.add_argument('-s', '--spec', help='spec file to group keys by, default True Black')
+    parser.add_argument('-j', '--json', help='also write the report as JSON')
+    parser.add_argument('--textconv', action='store_true', help='print a theme as key=#aarrggbb')
+    args = parser.parse_args(argv[1:])
+
+    if args.textconv:
+        for path in args.paths:
+            textconv(path)
+        return 0
+
+    spec = true_black
+    if args.spec:
+        import watch
+        spec = watch.load_spec(args.spec)
+    groups = palette_groups(spec)
+
+    if args.rev:
+        pairs = []
+        for path in args.paths:
+            files = set(attheme.expand_paths([path]))
+            if os.path.isdir(path):
+                files.update(git_files(args.rev, path))
+            pairs.extend((p, p, p) for p in sorted(files))
+
+        def load_old(p):
+            data = git_show(args.rev, p)
+            return None if data is None else parse_values(data)
+    else:
+        if len(args.paths) != 2:
+            parser.error('expected an old and a new path')
+        pairs = pairs_from_paths(*args.paths)
+
+        def load_old(p):
+            return attheme.load_values(p)
+
+    results = {}
+    unexpected = 0
+    for name, old_path, new_path in pairs:
+        old = load_old(old_path) if old_path is not None else None
+        new = attheme.load_values(new_path) if new_path is not None and os.path.exists(new_path) else None
+        if old is None or new is None:
+            print(f'{name}: only in {"new" if old is None else "old"}')
+            unexpected += 1
+            continue
+        report = compare(old, new, groups, args.expect, args.tolerance)
+        unexpected += report['unexpected']
+        if report['added'] or report['removed'] or report['changed']:
+            print_report(name, report, args.expect)
+        results[name] = report
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=1)
+    print(f'{len(pairs)} theme(s) compared, {unexpected} unexpected difference(s)')
+    return 1 if unexpected else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
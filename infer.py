@@ -0,0 +1,176 @@
+# Reverse compiles a theme into a build.py style palette + key spec
+# Usage: python infer.py [-r radius] [-s lab|oklab] [-j jobs] <themes, dirs or globs...>
+# Colours are split into an opaque base and an alpha (like with_alpha), the
+# bases are clustered in a perceptual space, and each cluster becomes a
+# palette entry named after its colour (black_20, white_60, blue_2, ...).
+# Clusters used by a single key stay inline as rgba(...). Writes
+# <theme>_spec.py next to each input. Requires numpy.
+
+import os
+import sys
+import argparse
+import colorsys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import attheme
+import colourspace
+from build import format_spec
+
+# deltaE under which two colours are treated as the same palette entry,
+# 0 keeps every distinct colour
+DEFAULT_RADIUS = 2.0
+MAX_ITERATIONS = 10
+
+HUE_NAMES = [
+    (15, 'red'), (45, 'orange'), (70, 'yellow'), (165, 'green'),
+    (195, 'cyan'), (255, 'blue'), (290, 'violet'), (345, 'pink'), (360, 'red'),
+]
+GREY_SATURATION = 0.12
+
+
+def cluster(points, weights, radius):
+    # Leader clustering (most used colours first) followed by weighted
+    # k-means steps whose centres are snapped to the nearest member, so every
+    # centre is a colour that actually occurs in the theme.
+    # Returns (centre indices, assignment of each point to a centre).
+    n = len(points)
+    assigned = np.full(n, -1)
+    centres = []
+    if n == 0:
+        return np.array(centres, dtype=np.intp), assigned
+    for i in np.argsort(-weights, kind='stable'):
+        if assigned[i] != -1:
+            continue
+        members = (np.linalg.norm(points - points[i], axis=1) <= radius) & (assigned == -1)
+        assigned[members] = len(centres)
+        centres.append(i)
+    centres = np.array(centres)
+
+    for _ in range(MAX_ITERATIONS):
+        d = np.linalg.norm(points[:, None, :] - points[None, centres, :], axis=-1)
+        assigned = d.argmin(axis=1)
+        new_centres = centres.copy()
+        for c in range(len(centres)):
+            members = np.flatnonzero(assigned == c)
+            mean = np.average(points[members], axis=0, weights=weights[members])
+            new_centres[c] = members[np.linalg.norm(points[members] - mean, axis=1).argmin()]
+        if np.array_equal(new_centres, centres):
+            break
+        centres = new_centres
+    return centres, assigned
+
+
+def colour_name(rgb):
+    r, g, b = rgb
+    h, s, v = colorsys.rgb_to_hsv(r / 255, g / 255, b / 255)
+    if s < GREY_SATURATION:
+        level = round(v * 100)
+        if level == 0:
+            return 'black'
+        if level == 100:
+            return 'white'
+        if level == 50:
+            return 'gray'
+        return f'black_{level}' if level < 50 else f'white_{level}'
+    for limit, name in HUE_NAMES:
+        if h * 360 < limit:
+            return name
+    return 'red'
+
+
+def palette_order(rgb):
+    # greys from dark to light, then colours by hue
+    h, s, v = colorsys.rgb_to_hsv(*(c / 255 for c in rgb))
+    if s < GREY_SATURATION:
+        return (0, 0, v)
+    return (1, round(h * 360), v)
+
+
+def rgba_literal(rgb):
+    return f'rgba({rgb[0]}, {rgb[1]}, {rgb[2]})'
+
+
+def infer_spec(values, radius=DEFAULT_RADIUS, space='lab'):
+    # values: key -> ARGB. Returns (palette, keys) as name -> expression text
+    if not values:
+        return {}, {}
+    keys = list(values)
+    argb = np.array([values[k] for k in keys], dtype=np.int64)
+    unique, inverse = np.unique(argb & 0xFFFFFF, return_inverse=True)
+    weights = np.bincount(inverse).astype(np.float64)
+
+    centres, assigned = cluster(colourspace.convert(unique, space), weights, radius)
+    key_cluster = assigned[inverse]
+    centre_rgb = [
+        ((int(unique[c]) >> 16) & 0xFF, (int(unique[c]) >> 8) & 0xFF, int(unique[c]) & 0xFF)
+        for c in centres
+    ]
+
+    # Clusters shared by several keys get a palette entry
+    uses = Counter(key_cluster.tolist())
+    shared = sorted((c for c, n in uses.items() if n > 1), key=lambda c: palette_order(centre_rgb[c]))
+    palette = {}
+    refs = {}
+    taken = Counter()
+    for c in shared:
+        # a numbered duplicate may itself be the name of a grey level
+        # (black_2), so count up until the name is free
+        name = base = colour_name(centre_rgb[c])
+        while name in palette:
+            taken[base] += 1
+            name = f'{base}_{taken[base] + 1}'
+        palette[name] = rgba_literal(centre_rgb[c])
+        refs[c] = name
+
+    spec_keys = {}
+    for key, c, v in zip(keys, key_cluster.tolist(), argb.tolist()):
+        expr = refs.get(c) or rgba_literal(centre_rgb[c])
+        alpha = v >> 24
+        if alpha != 0xFF:
+            expr += f'.with_alpha({alpha})'
+        spec_keys[key] = expr
+    return palette, spec_keys
+
+
+def spec_path(path):
+    return os.path.splitext(path)[0] + '_spec.py'
+
+
+def infer_file(job):
+    path, radius, space = job
+    palette, keys = infer_spec(attheme.load_values(path), radius, space)
+    outpath = spec_path(path)
+    with open(outpath, 'w') as f:
+        f.write(format_spec(palette, keys, f'Inferred from {os.path.basename(path)} by infer.py'))
+    return path, outpath, len(palette)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog=argv[0])
+    parser.add_argument('themes', nargs='+', help='theme files, directories or globs')
+    parser.add_argument('-r', '--radius', type=float, default=DEFAULT_RADIUS,
+                        help='deltaE under which colours are merged, 0 to keep all')
+    parser.add_argument('-s', '--space', choices=colourspace.SPACES, default='lab')
+    parser.add_argument('-j', '--jobs', type=int, default=None)
+    args = parser.parse_args(argv[1:])
+
+    failed = 0
+    paths = list(attheme.expand_paths(args.themes))
+    with ProcessPoolExecutor(args.jobs) as ex:
+        futures = [ex.submit(infer_file, (p, args.radius, args.space)) for p in paths]
+        for path, future in zip(paths, futures):
+            try:
+                _, outpath, size = future.result()
+            except (OSError, ValueError) as e:
+                failed += 1
+                print(f'{path}: Error: {e}')
+                continue
+            print(f'{path} -> {outpath}: {size} palette entries')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -1,24 +1,20 @@
 # Shows missing/old keys by comparing two themes
 # Usage: python keyinfo.py <your theme> <official theme>
+#        python keyinfo.py -r <official theme> [-r ...] [-f json|csv] <themes, dirs or globs...>
 
-import re
 import sys
-import colorsys
+import csv
+import json
 import random
+import argparse
+import colorsys
 
-RE_LINE = re.compile(r'^(\w+)=(.+)$')
+import attheme
 
 
 def get_keys(path):
-    keys = set()
-    with open(path) as f:
-        for i, line in enumerate(f, 1):
-            line = line.strip()
-            match = RE_LINE.match(line)
-            if not match:
-                continue
-            keys.add(match.group(1))
-    return keys
+    with attheme.reader(path) as f:
+        return set(f.keys())
 
 
 def get_debug_colour():
@@ -26,23 +22,113 @@ def get_debug_colour():
     s = random.uniform(0.3, 1)
     v = random.uniform(0.3, 1)
     rgb = [round(i * 255) for i in colorsys.hsv_to_rgb(h, s, v)]
-    return f'{{rgba({rgb[0]}, {rgb[1]}, {rgb[2]})}}'
-
-
-try:
-    our_keys = get_keys(sys.argv[1])
-    official_keys = get_keys(sys.argv[2])
-
-    removed_keys = our_keys - official_keys
-    new_keys = official_keys - our_keys
-
-    print(f'Removed keys:')
-    for k in removed_keys:
-        print(f'{k}={get_debug_colour()}')
-    print()
-    print(f'New keys:')
-    for k in new_keys:
-        print(f'{k}={get_debug_colour()}')
-    print()
-except RuntimeError as e:
-    print('Error:', e)
+    return f'rgba({rgb[0]}, {rgb[1]}, {rgb[2]})'
+
+
+class key_index:
+    # Interns key names to small ids so that a theme's key set is a single
+    # int bitmap, and set differences are one big-int operation
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+
+    def bitmap(self, keys):
+        ids = []
+        for key in keys:
+            i = self.ids.get(key)
+            if i is None:
+                i = self.ids[key] = len(self.names)
+                self.names.append(key)
+            ids.append(i)
+        bits = bytearray(len(self.names) // 8 + 1)
+        for i in ids:
+            bits[i >> 3] |= 1 << (i & 7)
+        return int.from_bytes(bits, 'little')
+
+    def load(self, path):
+        with attheme.reader(path) as f:
+            return self.bitmap(f.keys())
+
+    def names_of(self, bitmap):
+        names = []
+        for byte_i, byte in enumerate(bitmap.to_bytes(bitmap.bit_length() // 8 + 1, 'little')):
+            while byte:
+                low = byte & -byte
+                names.append(self.names[(byte_i << 3) + low.bit_length() - 1])
+                byte ^= low
+        return names
+
+
+def diff_themes(theme_paths, reference_paths):
+    # Every file is parsed once, no matter how many pairs it appears in
+    index = key_index()
+    references = [(path, index.load(path)) for path in reference_paths]
+    for path in theme_paths:
+        ours = index.load(path)
+        for ref_path, theirs in references:
+            yield {
+                'theme': path,
+                'reference': ref_path,
+                'removed': sorted(index.names_of(ours & ~theirs)),
+                'new': sorted(index.names_of(theirs & ~ours)),
+                'common': (ours & theirs).bit_count(),
+            }
+
+
+def write_json(results, out):
+    json.dump(list(results), out, indent=1)
+    out.write('\n')
+
+
+def write_csv(results, out):
+    writer = csv.writer(out)
+    writer.writerow(('theme', 'reference', 'change', 'key'))
+    for r in results:
+        for change in ('removed', 'new'):
+            for key in r[change]:
+                writer.writerow((r['theme'], r['reference'], change, key))
+
+
+def main(argv):
+    if len(argv) == 3 and not argv[1].startswith('-'):
+        our_keys = get_keys(argv[1])
+        official_keys = get_keys(argv[2])
+
+        removed_keys = our_keys - official_keys
+        new_keys = official_keys - our_keys
+
+        print(f'Removed keys:')
+        for k in removed_keys:
+            print(f'{k}={get_debug_colour()}')
+        print()
+        print(f'New keys:')
+        from build import true_black
+        from suggest import key_suggester
+        suggester = key_suggester(true_black.keys)
+        for k in new_keys:
+            s = suggester.suggest(k)
+            if s is None:
+                print(f'{k}={get_debug_colour()}')
+                continue
+            e, confidence, like = s
+            print(f'# {confidence:.2f}, like {like}')
+            print(f'{k}={e}')
+        print()
+        return
+
+    parser = argparse.ArgumentParser(prog=argv[0])
+    parser.add_argument('themes', nargs='+', help='theme files, directories or globs')
+    parser.add_argument('-r', '--reference', action='append', required=True,
+                        help='official theme to compare against, can be repeated')
+    parser.add_argument('-f', '--format', choices=('json', 'csv'), default='json')
+    args = parser.parse_args(argv[1:])
+
+    results = diff_themes(attheme.expand_paths(args.themes), attheme.expand_paths(args.reference))
+    {'json': write_json, 'csv': write_csv}[args.format](results, sys.stdout)
+
+
+if __name__ == '__main__':
+    try:
+        main(sys.argv)
+    except RuntimeError as e:
+        print('Error:', e)
@@ -0,0 +1,206 @@
+# Derived themes as overlays on a base spec
+# Usage: python layers.py [-o out.attheme] [-f] <layer.py...>
+# A layer file has the PALETTE/KEYS blocks of a spec, holding only what it
+# changes, plus BASE = '<path>' naming the layer (or build.py) it sits on,
+# relative to the layer file. Palette overrides reach every inherited key
+# that refers to them; new keys are appended after the base keys.
+#
+# Every layer in a chain is flattened into a table of
+#   name -> (palette reference or None, alpha or None, ARGB)
+# for the palette and the keys, cached in .layer_cache.json under a digest
+# of the layer and all layers below it. Rebuilding starts from the deepest
+# layer whose table is still valid and re-resolves only what the changed
+# layers touch, so a derivative costs little more than reading its own file.
+
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+
+import attheme
+from build import to_argb, to_signed_32bit
+from cache import write_atomic, write_if_changed
+from watch import RE_BLOCK, parse_block
+
+RE_BASE = re.compile(r"^BASE = '([^']*)'", re.M)
+LAYER_CACHE_PATH = '.layer_cache.json'
+# bump when the table format changes
+LAYER_CACHE_VERSION = 1
+# tables not used by the current run are dropped beyond this many
+MAX_TABLES = 64
+
+
+def base_path(path, source):
+    match = RE_BASE.search(source)
+    if match is None:
+        return None
+    return os.path.normpath(os.path.join(os.path.dirname(path), match[1]))
+
+
+def read_layer(path):
+    # -> (palette, keys) as name -> colour_expr
+    with open(path) as f:
+        source = f.read()
+    blocks = {'palette': '', 'keys': ''}
+    for name, text in RE_BLOCK.findall(source):
+        blocks['palette' if name.endswith('PALETTE') else 'keys'] = text
+    parsed = {}
+    return parse_block(blocks['palette'], parsed), parse_block(blocks['keys'], parsed)
+
+
+def with_ref(ref, alpha, argb):
+    if alpha is not None:
+        argb = (argb & 0xFFFFFF) | (alpha << 24)
+    return ref, alpha, argb
+
+
+def entry(e, lookup):
+    # (reference, alpha, ARGB) of an expression, lookup gives palette entries
+    if isinstance(e.base, str):
+        return with_ref(e.base, e.alpha, lookup(e.base)[2])
+    return with_ref(None, e.alpha, to_argb(*e.base))
+
+
+def apply_layer(table, palette_exprs, key_exprs):
+    # Flattens a layer onto its base table. The (small) palette is resolved
+    # again in full, keys only if the layer sets them or they refer to a
+    # palette name whose colour changed.
+    if table is None:
+        table = {'palette': {}, 'keys': {}}
+    base = table['palette']
+    palette = {}
+    visiting = set()
+
+    def lookup(name):
+        try:
+            return palette[name]
+        except KeyError:
+            pass
+        if name in visiting:
+            raise ValueError(f'palette cycle through {name}')
+        visiting.add(name)
+        if name in palette_exprs:
+            palette[name] = entry(palette_exprs[name], lookup)
+        elif name in base:
+            ref, alpha, argb = base[name]
+            palette[name] = base[name] if ref is None else with_ref(ref, alpha, lookup(ref)[2])
+        else:
+            raise NameError(f'{name} is not in the palette')
+        return palette[name]
+
+    for name in list(base) + [n for n in palette_exprs if n not in base]:
+        lookup(name)
+    changed = {name for name, v in palette.items() if base.get(name) != v}
+
+    keys = {}
+    for key, old in table['keys'].items():
+        if key in key_exprs:
+            keys[key] = entry(key_exprs[key], lookup)
+        elif old[0] in changed:
+            keys[key] = with_ref(old[0], old[1], palette[old[0]][2])
+        else:
+            keys[key] = old
+    for key, e in key_exprs.items():
+        if key not in keys:
+            keys[key] = entry(e, lookup)
+    return {'palette': palette, 'keys': keys}
+
+
+class layer_cache:
+    def __init__(self, path=LAYER_CACHE_PATH):
+        self.path = path
+        self.dirty = False
+        self.used = set()
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            if data.get('version') != LAYER_CACHE_VERSION:
+                raise ValueError
+            self.tables = data['tables']
+        except (FileNotFoundError, ValueError, KeyError):
+            self.tables = {}
+
+    def lookup(self, digest):
+        table = self.tables.get(digest)
+        if table is None:
+            return None
+        self.used.add(digest)
+        return {part: {k: tuple(v) for k, v in table[part].items()} for part in ('palette', 'keys')}
+
+    def store(self, digest, table):
+        self.tables[digest] = table
+        self.used.add(digest)
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        if len(self.tables) > MAX_TABLES:
+            self.tables = {d: t for d, t in self.tables.items() if d in self.used}
+        write_atomic(self.path, json.dumps({'version': LAYER_CACHE_VERSION, 'tables': self.tables}))
+        self.dirty = False
+
+
+def layer_chain(path):
+    # [(path, digest)] from the root spec up to path
+    chain = []
+    seen = set()
+    while path is not None:
+        if path in seen:
+            raise ValueError(f'layer cycle through {path}')
+        seen.add(path)
+        with open(path, 'rb') as f:
+            source = f.read()
+        chain.append((path, source))
+        path = base_path(path, source.decode())
+    chain.reverse()
+    digests = []
+    digest = str(LAYER_CACHE_VERSION)
+    for path, source in chain:
+        digest = hashlib.sha256(digest.encode() + b'\0' + source).hexdigest()
+        digests.append((path, digest))
+    return digests
+
+
+def flatten(path, cache=None):
+    # -> (key -> ARGB, number of layers that had to be resolved)
+    chain = layer_chain(path)
+    table = None
+    start = 0
+    if cache is not None:
+        for i in range(len(chain) - 1, -1, -1):
+            table = cache.lookup(chain[i][1])
+            if table is not None:
+                start = i + 1
+                break
+    for layer_path, digest in chain[start:]:
+        table = apply_layer(table, *read_layer(layer_path))
+        if cache is not None:
+            cache.store(digest, table)
+    return {key: v[2] for key, v in table['keys'].items()}, len(chain) - start
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog=argv[0])
+    parser.add_argument('layers', nargs='+', help='layer files, directories or globs')
+    parser.add_argument('-o', '--output', help='output path, only with a single layer')
+    parser.add_argument('-f', '--force', action='store_true', help='ignore the layer cache')
+    args = parser.parse_args(argv[1:])
+
+    paths = list(attheme.expand_paths(args.layers, ('.py',)))
+    if args.output and len(paths) != 1:
+        parser.error('-o needs exactly one layer')
+    cache = None if args.force else layer_cache()
+    for path in paths:
+        values, resolved = flatten(path, cache)
+        out = args.output or os.path.splitext(os.path.basename(path))[0] + '.attheme'
+        write_if_changed(out, '\n'.join(f'{k}={to_signed_32bit(v)}' for k, v in values.items()))
+        print(f'{path} -> {out}: {len(values)} keys, {resolved} layer(s) resolved')
+    if cache is not None:
+        cache.save()
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,19 @@
+# True Black with a blue accent and blue outgoing bubbles
+BASE = '../build.py'
+
+PALETTE = '''
+blue = rgba(41, 121, 255)
+deep_blue = rgba(13, 55, 120)
+'''
+
+KEYS = '''
+chat_outBubble=deep_blue
+chat_outBubbleSelected=blue.with_alpha(96)
+chat_outLoader=blue
+chat_outReplyLine=blue
+chat_outReplyNameText=blue
+chat_messagePanelSend=blue
+chats_unreadCounter=deep_blue
+checkboxSquareBackground=blue
+windowBackgroundWhiteBlueText=blue
+'''
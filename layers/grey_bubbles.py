@@ -0,0 +1,10 @@
+# True Black with grey message bubbles
+BASE = '../build.py'
+
+KEYS = '''
+chat_inBubble=black_20
+chat_inBubbleSelected=black_30
+chat_outBubble=black_30
+chat_outBubbleSelected=black_40
+chat_outLoader=black_40
+'''
@@ -0,0 +1,190 @@
+# Three-way merge of official theme updates into our spec
+# Usage: python merge.py [-s spec.py] [-o merged_spec.py] [-r report.json] <official themes...>
+# The official themes are given oldest first (globs expand sorted); every
+# consecutive pair (old, new) is merged into the spec in turn, so a whole
+# version history is replayed in one run. Per key:
+#   added upstream    proposed from our expression for keys that have the
+#                     same official colour, else from the keys with the most
+#                     similar names (suggest.py), else the nearest colour
+#   removed upstream  dropped from the spec
+#   changed upstream  taken over if ours still had the old official colour,
+#                     as a palette reference when the palette has it; kept
+#                     as is if ours already has the new colour; otherwise
+#                     kept and reported as a conflict
+# The merged spec is written in the PALETTE/KEYS layout that infer.py,
+# watch.py and export.py -s read.
+
+import sys
+import json
+import argparse
+from collections import Counter, defaultdict
+
+import attheme
+from suggest import key_suggester
+from build import true_black, theme_spec, colour_expr, format_spec, unpack_rgb
+
+
+def literal(argb):
+    alpha = argb >> 24
+    return colour_expr(unpack_rgb(argb), None if alpha == 0xFF else alpha)
+
+
+def palette_names(spec):
+    # ARGB -> the first palette entry with that colour
+    names = {}
+    for name, e in spec.palette.items():
+        names.setdefault(spec.resolve(e), name)
+    return names
+
+
+def palette_expr(names, argb):
+    # a palette reference for argb (with_alpha of an opaque entry if need be),
+    # or a literal if the palette doesn't have the colour
+    name = names.get(argb)
+    if name is not None:
+        return colour_expr(name, None)
+    name = names.get(argb | 0xFF000000)
+    if name is not None:
+        return colour_expr(name, argb >> 24)
+    return literal(argb)
+
+
+def colour_dist(a, b):
+    return sum((x - y) ** 2 for x, y in zip(unpack_rgb(a) + (a >> 24,), unpack_rgb(b) + (b >> 24,))) ** 0.5
+
+
+# name suggestions below this confidence lose to the nearest colour
+NAME_CONFIDENCE = 0.5
+
+
+class proposer:
+    # official colour -> how often each of our expressions is used for it,
+    # over the keys both themes have
+    def __init__(self, official, keys, palette_names):
+        self.palette_names = palette_names
+        self.index = defaultdict(Counter)
+        for key, e in keys.items():
+            argb = official.get(key)
+            if argb is not None:
+                self.index[argb][e] += 1
+        self.names = key_suggester(keys)
+
+    def propose(self, key, argb):
+        # -> (expression, what it was based on)
+        if argb in self.index:
+            return self.index[argb].most_common(1)[0][0], 'colour'
+        s = self.names.suggest(key)
+        if s is not None and s[1] >= NAME_CONFIDENCE:
+            return s[0], f'name ({s[2]}, {s[1]:.2f})'
+        if not self.index:
+            return palette_expr(self.palette_names, argb), 'official'
+        match = min(self.index, key=lambda c: colour_dist(c, argb))
+        return self.index[match].most_common(1)[0][0], f'nearest colour #{match:08x}'
+
+
+def merge(old, new, spec):
+    # old, new: key -> ARGB of two official versions; returns (keys, report)
+    # where keys is the merged key -> colour_expr in output order
+    ours = spec.keys
+    report = {'added': [], 'removed': [], 'updated': [], 'conflicts': [], 'ours_only': []}
+
+    names = palette_names(spec)
+    keys = {}
+    for key, e in ours.items():
+        if key in old and key not in new:
+            report['removed'].append(key)
+            continue
+        if key not in old and key not in new:
+            report['ours_only'].append(key)
+        if key in old and key in new and old[key] != new[key]:
+            argb = spec.resolve(e)
+            if argb == old[key]:
+                e = palette_expr(names, new[key])
+                report['updated'].append({'key': key, 'new': f'#{new[key]:08x}'})
+            elif argb != new[key]:
+                report['conflicts'].append({
+                    'key': key,
+                    'old': f'#{old[key]:08x}',
+                    'new': f'#{new[key]:08x}',
+                    'ours': str(e),
+                })
+        keys[key] = e
+
+    # New keys go after the key that precedes them upstream, or first
+    proposals = proposer(new, keys, names)
+    after = defaultdict(list)
+    anchor = None
+    for key, argb in new.items():
+        if key in keys:
+            anchor = key
+        elif key not in old:
+            e, basis = proposals.propose(key, argb)
+            after[anchor].append((key, e))
+            report['added'].append({
+                'key': key,
+                'official': f'#{argb:08x}',
+                'proposed': str(e),
+                'basis': basis,
+            })
+
+    merged = {key: e for key, e in after[None]}
+    for key, e in keys.items():
+        merged[key] = e
+        merged.update(after[key])
+    return merged, report
+
+
+def merge_history(paths, spec):
+    # -> (merged spec, [(old path, new path, report), ...])
+    reports = []
+    old = attheme.load_values(paths[0])
+    for old_path, new_path in zip(paths, paths[1:]):
+        new = attheme.load_values(new_path)
+        keys, report = merge(old, new, spec)
+        spec = theme_spec(spec.palette, keys)
+        reports.append((old_path, new_path, report))
+        old = new
+    return spec, reports
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog=argv[0])
+    parser.add_argument('themes', nargs='+', help='official themes, oldest first')
+    parser.add_argument('-s', '--spec', help='spec file with PALETTE and KEYS blocks, default True Black')
+    parser.add_argument('-o', '--output', default='merged_spec.py')
+    parser.add_argument('-r', '--report', help='write the conflict report as JSON')
+    args = parser.parse_args(argv[1:])
+
+    paths = list(attheme.expand_paths(args.themes))
+    if len(paths) < 2:
+        parser.error('expected at least two official themes')
+    spec = true_black
+    if args.spec:
+        import watch
+        spec = watch.load_spec(args.spec)
+
+    merged, reports = merge_history(paths, spec)
+    for old, new, report in reports:
+        print(
+            f'{old} -> {new}: {len(report["added"])} added, {len(report["removed"])} removed, '
+            f'{len(report["updated"])} updated, {len(report["conflicts"])} conflict(s)'
+        )
+        for c in report['conflicts']:
+            print(f'  conflict: {c["key"]} {c["old"]} -> {c["new"]}, ours is {c["ours"]}')
+
+    with open(args.output, 'w') as f:
+        f.write(format_spec(
+            {name: str(e) for name, e in merged.palette.items()},
+            {key: str(e) for key, e in merged.keys.items()},
+            f'Merged from {paths[0]} .. {paths[-1]} by merge.py'
+        ))
+    print(f'{len(merged.keys)} keys written to {args.output}')
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump([{'old': o, 'new': n, **r} for o, n, r in reports], f, indent=1)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
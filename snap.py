@@ -0,0 +1,172 @@
+# Snaps an arbitrary theme onto the True Black palette
+# Usage: python snap.py [-t tolerance] [-s lab|oklab] [-j jobs] [-r report.json] <themes...>
+#        python snap.py --check
+# Every value is moved to the nearest palette colour (deltaE, alpha is
+# kept) if one is within the tolerance, otherwise it is left alone and
+# flagged. Writes <theme>.snapped.attheme next to each input. Requires numpy.
+# python snap.py --check snaps true_black.attheme onto its own palette and
+# exits with 1 if that moved or flagged any key.
+
+import os
+import sys
+import json
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import attheme
+import colourspace
+from build import true_black, colour_expr, to_signed_32bit
+
+# OKLab stretches the darkest greys a lot, CIELAB keeps them linear, which
+# suits a palette that is mostly near-black
+DEFAULT_SPACE = 'lab'
+DEFAULT_TOLERANCE = {'lab': 4.0, 'oklab': 0.04}
+
+
+def palette_entries(spec):
+    # Named palette colours plus the rgba(...) literals used by the keys,
+    # opaque ones only since alpha is carried over from the snapped value.
+    # A literal's own alpha (rgba(r, g, b, a)) is dropped for the same reason
+    entries = {}
+    for name, e in spec.palette.items():
+        if name.startswith('placeholder_'):
+            continue
+        entries.setdefault(spec.resolve(e), name)
+    for e in spec.keys.values():
+        if not isinstance(e.base, str):
+            base = colour_expr(e.base[:3], None)
+            entries.setdefault(spec.resolve(base), str(base))
+    entries = {argb: name for argb, name in entries.items() if argb >> 24 == 0xFF}
+    return list(entries.values()), np.array(list(entries), dtype=np.int64)
+
+
+class palette_index:
+    def __init__(self, names, values, space=DEFAULT_SPACE):
+        self.names = names
+        self.values = values
+        self.space = space
+        self.points = colourspace.convert(values, space)
+
+    def query(self, values, chunk_size=4096):
+        # -> (index of nearest palette entry, deltaE) for each ARGB value.
+        # Themes repeat a handful of colours, so only unique RGBs are measured
+        values = np.asarray(values, dtype=np.int64)
+        unique, inverse = np.unique(values & 0xFFFFFF, return_inverse=True)
+        nearest = np.empty(len(unique), dtype=np.intp)
+        distance = np.empty(len(unique))
+        for start in range(0, len(unique), chunk_size):
+            points = colourspace.convert(unique[start:start + chunk_size], self.space)
+            d = np.linalg.norm(points[:, None, :] - self.points[None, :, :], axis=-1)
+            nearest[start:start + chunk_size] = d.argmin(axis=1)
+            distance[start:start + chunk_size] = d.min(axis=1)
+        return nearest[inverse], distance[inverse]
+
+
+def snap_theme(index, inpath, outpath, tolerance):
+    report = []
+    with attheme.reader(inpath) as src, attheme.writer(outpath) as dst:
+        records = list(src.records())
+        rows = [(key, attheme.parse_value(value)) for _, key, value in records if key is not None]
+        nearest, distance = index.query([v for _, v in rows])
+
+        snapped = {}
+        for (key, old), i, d in zip(rows, nearest.tolist(), distance.tolist()):
+            alpha = old >> 24
+            new = (alpha << 24) | (int(index.values[i]) & 0xFFFFFF)
+            ref = index.names[i] if alpha == 0xFF else f'{index.names[i]}.with_alpha({alpha})'
+            ok = d <= tolerance
+            if ok:
+                snapped[key] = new
+            report.append({
+                'key': key,
+                'old': f'#{old:08x}',
+                'new': f'#{new:08x}',
+                'ref': ref,
+                'delta_e': round(d, 5),
+                'snapped': ok,
+            })
+
+        for _, key, value in records:
+            if key is None:
+                dst.write_line(value)
+            elif key in snapped:
+                dst.write(key, to_signed_32bit(snapped[key]))
+            else:
+                dst.write(key, value)
+        if src.wallpaper is not None:
+            dst.write_wallpaper(src.wallpaper)
+    return report
+
+
+def snapped_path(path):
+    return os.path.splitext(path)[0] + '.snapped.attheme'
+
+
+def check(path='true_black.attheme', space=DEFAULT_SPACE):
+    # The theme built from the palette must be a fixed point of snapping it
+    index = palette_index(*palette_entries(true_black), space)
+    with tempfile.TemporaryDirectory() as tmp:
+        report = snap_theme(index, path, os.path.join(tmp, 'snapped.attheme'), 0.0)
+    failed = [r for r in report if not r['snapped'] or r['old'] != r['new']]
+    for r in failed:
+        print(f"{r['key']}: {r['old']} -> {r['new']} ({r['ref']}, deltaE {r['delta_e']})")
+    print(f'{path}: {len(failed)} of {len(report)} key(s) not a fixed point')
+    return 1 if failed else 0
+
+
+# Built once per worker process
+_index = None
+
+
+def _init_worker(space):
+    global _index
+    _index = palette_index(*palette_entries(true_black), space)
+
+
+def _snap_worker(job):
+    inpath, tolerance = job
+    outpath = snapped_path(inpath)
+    return inpath, outpath, snap_theme(_index, inpath, outpath, tolerance)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog=argv[0])
+    parser.add_argument('themes', nargs='*', help='theme files, directories or globs')
+    parser.add_argument('-t', '--tolerance', type=float, default=None,
+                        help='largest deltaE a value may be moved by')
+    parser.add_argument('-s', '--space', choices=DEFAULT_TOLERANCE, default=DEFAULT_SPACE)
+    parser.add_argument('-j', '--jobs', type=int, default=None)
+    parser.add_argument('-r', '--report', help='write the per-key report as JSON')
+    parser.add_argument('--check', action='store_true',
+                        help='check that true_black.attheme snaps onto itself')
+    args = parser.parse_args(argv[1:])
+    if args.check:
+        return check(space=args.space)
+    if not args.themes:
+        parser.error('no themes given')
+    tolerance = args.tolerance
+    if tolerance is None:
+        tolerance = DEFAULT_TOLERANCE[args.space]
+
+    paths = [
+        p for p in attheme.expand_paths(args.themes)
+        if not p.endswith('.snapped.attheme')
+    ]
+    reports = {}
+    with ProcessPoolExecutor(args.jobs, initializer=_init_worker, initargs=(args.space,)) as ex:
+        for inpath, outpath, report in ex.map(_snap_worker, ((p, tolerance) for p in paths)):
+            moved = sum(r['snapped'] and r['old'] != r['new'] for r in report)
+            flagged = sum(not r['snapped'] for r in report)
+            print(f'{inpath} -> {outpath}: {moved} snapped, {flagged} flagged')
+            reports[inpath] = report
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(reports, f, indent=1)
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
@@ -0,0 +1,133 @@
+# Suggests colours for new theme keys from the keys we already have
+# Usage: python suggest.py [-s spec.py] <new keys...>
+# Key names are split into camelCase/underscore tokens. Existing keys are
+# found through an inverted index of those tokens (weighted by how rare a
+# token is) and a character trie for the longest shared prefix, so
+# chat_inReplyLineV2 lands next to chat_inReplyLine. The expression used
+# by the most similar keys wins, and the confidence says how similar they
+# were and how much they agreed.
+
+import re
+import sys
+import math
+import heapq
+import argparse
+from collections import defaultdict
+
+RE_TOKEN = re.compile(r'[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+')
+# similar keys that get a vote
+TOP_K = 5
+# share of the score that comes from the token overlap, the rest is prefix
+TOKEN_WEIGHT = 0.6
+# tokens in more than this share of the keys (chat, background, ...) only
+# count towards the score, they don't bring in candidates by themselves
+COMMON = 1 / 20
+# votes are similarity ** SHARPNESS, so one close sibling beats a few
+# loosely related keys
+SHARPNESS = 3
+
+
+def tokenize(key):
+    return [t.lower() for t in RE_TOKEN.findall(key)]
+
+
+class key_suggester:
+    def __init__(self, keys):
+        # keys: key -> colour_expr (or anything printable)
+        self.names = list(keys)
+        self.exprs = list(keys.values())
+        self.postings = defaultdict(list)
+        self.tokens = [set(tokenize(name)) for name in self.names]
+        for i, ts in enumerate(self.tokens):
+            for t in ts:
+                self.postings[t].append(i)
+        n = len(self.names)
+        self.idf = {t: math.log(1 + n / len(ids)) for t, ids in self.postings.items()}
+        # tokens no key has weigh as much as the rarest ones
+        self.unseen_idf = math.log(1 + n)
+        self.common = {t for t, ids in self.postings.items() if len(ids) > n * COMMON}
+        self.weight = [sum(self.idf[t] for t in ts) for ts in self.tokens]
+
+        # each trie node is (children, ids of keys below it)
+        self.trie = ({}, [])
+        for i, name in enumerate(self.names):
+            node = self.trie
+            for c in name:
+                node = node[0].setdefault(c, ({}, []))
+                node[1].append(i)
+
+    def prefix_matches(self, name):
+        # -> (length of the longest prefix shared with any key, those keys)
+        node, depth = self.trie, 0
+        for c in name:
+            child = node[0].get(c)
+            if child is None:
+                break
+            node, depth = child, depth + 1
+        return depth, node[1]
+
+    def similar(self, name):
+        # -> [(similarity, index)], most similar first
+        tokens = set(tokenize(name))
+        own = sum(self.idf.get(t, self.unseen_idf) for t in tokens)
+        rare = [t for t in tokens if t in self.idf and t not in self.common]
+        candidates = set()
+        for t in rare or (t for t in tokens if t in self.idf):
+            candidates.update(self.postings[t])
+
+        depth, ids = self.prefix_matches(name)
+        prefix = dict.fromkeys(ids, depth)
+        candidates.update(prefix)
+
+        idf, names = self.idf, self.names
+        scores = []
+        for i in candidates:
+            s = sum(idf[t] for t in tokens & self.tokens[i])
+            union = own + self.weight[i] - s
+            token_score = s / union if union else 0
+            prefix_score = prefix.get(i, 0) / max(len(name), len(names[i]))
+            scores.append((TOKEN_WEIGHT * token_score + (1 - TOKEN_WEIGHT) * prefix_score, i))
+        # ties go to the alphabetically first key, so results are stable
+        return heapq.nsmallest(TOP_K, scores, key=lambda x: (-x[0], names[x[1]]))
+
+    def suggest(self, name):
+        # -> (expression, confidence 0-1, most similar key with it) or None
+        top = self.similar(name)
+        if not top:
+            return None
+        votes = defaultdict(float)
+        best = {}
+        for score, i in top:
+            e = self.exprs[i]
+            votes[e] += score ** SHARPNESS
+            best.setdefault(e, (score, i))
+        e = max(votes, key=votes.get)
+        score, i = best[e]
+        confidence = score * votes[e] / sum(votes.values())
+        return e, confidence, self.names[i]
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog=argv[0])
+    parser.add_argument('keys', nargs='+', help='new key names')
+    parser.add_argument('-s', '--spec', help='spec file with PALETTE and KEYS blocks, default True Black')
+    args = parser.parse_args(argv[1:])
+
+    if args.spec:
+        import watch
+        spec = watch.load_spec(args.spec)
+    else:
+        from build import true_black as spec
+    suggester = key_suggester(spec.keys)
+    for key in args.keys:
+        s = suggester.suggest(key)
+        if s is None:
+            print(f'# no similar keys for {key}')
+            continue
+        e, confidence, like = s
+        print(f'# {confidence:.2f}, like {like}')
+        print(f'{key}={e}')
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,123 @@
+# Loads Telegram Desktop palettes (.tdesktop-palette, or the
+# colors.tdesktop-theme inside a .tdesktop-theme zip) as key -> ARGB, the
+# same table attheme.load_values gives for Android themes.
+# Usage: python tdesktop.py [-j jobs] <palettes, themes, dirs or globs...>
+# writes <input>.attheme (true_black.tdesktop-theme.attheme, say) next to
+# each input for the .attheme tools, so an Android theme of the same name is
+# never overwritten.
+# Entries are either a colour (#rrggbb or #rrggbbaa) or the name of another
+# entry. Every entry refers to at most one other, so references form chains
+# that are walked iteratively; each chain is resolved once and every entry
+# on it is memoised, which keeps bulk imports linear in the palette size.
+
+import re
+import sys
+import zipfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import attheme
+from build import to_signed_32bit
+
+RE_COMMENT = re.compile(r'//[^\n]*|/\*.*?\*/', re.S)
+RE_ENTRY = re.compile(r'(\w+)\s*:\s*(#[0-9a-fA-F]{8}|#[0-9a-fA-F]{6}|\w+)\s*;')
+EXTENSIONS = ('.tdesktop-palette', '.tdesktop-theme')
+THEME_MEMBERS = ('colors.tdesktop-theme', 'colors.tdesktop-palette')
+
+
+def parse_colour(value):
+    # '#rrggbb[aa]' -> ARGB
+    rgb = int(value[1:7], 16)
+    alpha = int(value[7:9], 16) if len(value) == 9 else 0xFF
+    return (alpha << 24) | rgb
+
+
+def parse_palette(text):
+    # key -> ARGB int for colours, or the referenced key name
+    entries = {}
+    for key, value in RE_ENTRY.findall(RE_COMMENT.sub('', text)):
+        entries[key] = parse_colour(value) if value[0] == '#' else value
+    return entries
+
+
+def resolve(entries):
+    # Flattens references, raises NameError for a reference to a missing
+    # entry and ValueError for a cycle
+    values = {}
+    for key in entries:
+        chain = []
+        on_chain = set()
+        value = key
+        while isinstance(value, str):
+            if value in values:
+                value = values[value]
+                break
+            if value in on_chain:
+                cycle = chain[chain.index(value):] + [value]
+                raise ValueError(f'reference cycle: {" -> ".join(cycle)}')
+            try:
+                target = entries[value]
+            except KeyError:
+                raise NameError(f'{chain[-1]} refers to {value}, which is not defined') from None
+            chain.append(value)
+            on_chain.add(value)
+            value = target
+        for k in chain:
+            values[k] = value
+    return {key: values[key] for key in entries}
+
+
+def read_text(path):
+    if path.endswith('.tdesktop-theme'):
+        with zipfile.ZipFile(path) as z:
+            names = set(z.namelist())
+            for member in THEME_MEMBERS:
+                if member in names:
+                    return z.read(member).decode()
+        raise ValueError(f'{path} has no {" or ".join(THEME_MEMBERS)}')
+    with open(path, encoding='utf-8') as f:
+        return f.read()
+
+
+def load_values(path):
+    return resolve(parse_palette(read_text(path)))
+
+
+def attheme_path(path):
+    # keeps the input's extension: build.py export writes <name>.attheme and
+    # <name>.tdesktop-theme side by side
+    return path + '.attheme'
+
+
+def convert_file(path):
+    outpath = attheme_path(path)
+    values = load_values(path)
+    with attheme.writer(outpath) as dst:
+        for key, argb in values.items():
+            dst.write(key, to_signed_32bit(argb))
+    return path, outpath, len(values)
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog=argv[0])
+    parser.add_argument('paths', nargs='+', help='palettes, themes, directories or globs')
+    parser.add_argument('-j', '--jobs', type=int, default=None)
+    args = parser.parse_args(argv[1:])
+
+    failed = 0
+    paths = list(attheme.expand_paths(args.paths, EXTENSIONS))
+    with ProcessPoolExecutor(args.jobs) as ex:
+        futures = [ex.submit(convert_file, p) for p in paths]
+        for path, future in zip(paths, futures):
+            try:
+                _, outpath, count = future.result()
+            except (OSError, ValueError, NameError, zipfile.BadZipFile) as e:
+                failed += 1
+                print(f'{path}: Error: {e}')
+                continue
+            print(f'{path} -> {outpath} ({count} keys)')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
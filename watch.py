@@ -0,0 +1,223 @@
+# Live rebuild: python build.py watch [-s spec.py] [-o out.attheme] [--sync dir] [--poll]
+# Keeps one warm process that watches the spec source (build.py or an
+# infer.py style *_spec.py) and rewrites the theme whenever it is saved.
+# Only the PALETTE/KEYS text blocks are re-read; entries whose expression
+# and palette colours didn't change keep their rendered line. Changes to the
+# renderer itself still need a restart.
+# Uses inotify on Linux and falls back to polling the file's size/mtime.
+
+import os
+import re
+import sys
+import time
+import ctypes
+import ctypes.util
+import select
+import struct
+import argparse
+
+from build import RE_ENTRY, colour_expr, theme_spec, to_signed_32bit
+from cache import file_stamp, write_if_changed
+
+RE_BLOCK = re.compile(r"^(\w*(?:PALETTE|KEYS)) = '''(.*?)'''", re.M | re.S)
+
+# editors save in place or write a new file and rename it over the old one
+IN_CLOSE_WRITE = 0x08
+IN_MOVED_TO = 0x80
+IN_CREATE = 0x100
+EVENT = struct.Struct('iIII')
+
+POLL_INTERVAL = 0.05
+# further events within this window are folded into one rebuild
+DEBOUNCE = 0.02
+
+
+def parse_block(text, parsed):
+    # parse_entries, but lines seen in an earlier version come from parsed
+    entries = {}
+    for i, line in enumerate(text.strip().split('\n'), 1):
+        try:
+            name, e = parsed[line]
+        except KeyError:
+            stripped = line.strip()
+            if not stripped or stripped.startswith('#'):
+                continue
+            match = RE_ENTRY.match(stripped)
+            if not match:
+                raise ValueError(f'line {i}: expected name=colour but got {stripped!r}')
+            name, e = parsed[line] = match[1], colour_expr.parse(match[2])
+        entries[name] = e
+    return entries
+
+
+def load_spec(path, parsed=None):
+    if parsed is None:
+        parsed = {}
+    with open(path) as f:
+        source = f.read()
+    blocks = {}
+    for name, text in RE_BLOCK.findall(source):
+        blocks['palette' if name.endswith('PALETTE') else 'keys'] = text
+    if len(blocks) != 2:
+        raise ValueError(f'{path} has no PALETTE and KEYS blocks')
+    return theme_spec(parse_block(blocks['palette'], parsed), parse_block(blocks['keys'], parsed))
+
+
+class inotify_watcher:
+    def __init__(self, path):
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        directory = os.path.dirname(os.path.abspath(path))
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(self.fd, directory.encode(), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f'cannot watch {directory}')
+        self.name = os.path.basename(path).encode()
+
+    def wait(self, timeout=None):
+        while True:
+            if not select.select([self.fd], [], [], timeout)[0]:
+                return False
+            try:
+                data = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                continue
+            pos = 0
+            while pos < len(data):
+                _, _, _, size = EVENT.unpack_from(data, pos)
+                pos += EVENT.size
+                if data[pos:pos + size].rstrip(b'\0') == self.name:
+                    return True
+                pos += size
+
+    def close(self):
+        os.close(self.fd)
+
+
+class poll_watcher:
+    def __init__(self, path, interval=POLL_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.stamp = file_stamp(path)
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            stamp = file_stamp(self.path)
+            if stamp != self.stamp:
+                self.stamp = stamp
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(self.interval)
+
+    def close(self):
+        pass
+
+
+def make_watcher(path, poll=False):
+    if not poll:
+        try:
+            return inotify_watcher(path)
+        except (OSError, AttributeError):
+            # no inotify on this platform
+            pass
+    return poll_watcher(path)
+
+
+class live_theme:
+    # Rendered lines of the last spec, by key, so an update only touches
+    # the keys whose expression or palette colour changed
+    def __init__(self):
+        self.spec = None
+        self.palette = {}
+        self.lines = {}
+        # spec source line -> (name, colour_expr)
+        self.parsed = {}
+
+    def update(self, spec):
+        palette = {name: spec.resolve(e) for name, e in spec.palette.items()}
+        changed_palette = {
+            name for name, argb in palette.items()
+            if self.palette.get(name) != argb
+        }
+        old_keys = self.spec.keys if self.spec is not None else {}
+        changed = []
+        lines = {}
+        for key, e in spec.keys.items():
+            line = self.lines.get(key)
+            if line is None or old_keys[key] != e or e.base in changed_palette:
+                new = f'{key}={to_signed_32bit(spec.resolve(e))}'
+                if new != line:
+                    changed.append(key)
+                line = new
+            lines[key] = line
+        removed = [key for key in self.lines if key not in lines]
+        reordered = not changed and not removed and list(lines) != list(self.lines)
+        self.spec, self.palette, self.lines = spec, palette, lines
+        return changed, removed, reordered
+
+    def render(self):
+        return '\n'.join(self.lines.values())
+
+
+def publish(data, out, sync_dir):
+    write_if_changed(out, data)
+    if sync_dir is not None:
+        write_if_changed(os.path.join(sync_dir, os.path.basename(out)), data)
+
+
+def rebuild(theme, spec_path, out, sync_dir, first=False):
+    start = time.perf_counter()
+    try:
+        spec = load_spec(spec_path, theme.parsed)
+        changed, removed, reordered = theme.update(spec)
+    except (OSError, ValueError, NameError, SyntaxError, TypeError) as e:
+        # TypeError comes from to_argb, for rgba(1, 2) and the like
+        print(f'{spec_path}: {e}')
+        return
+    if first or changed or removed or reordered:
+        publish(theme.render(), out, sync_dir)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f'{out}: {len(changed)} changed, {len(removed)} removed in {elapsed:.1f} ms')
+
+
+def default_output(spec_path):
+    if os.path.basename(spec_path) == 'build.py':
+        return os.path.join(os.path.dirname(spec_path), 'true_black.attheme')
+    root = os.path.splitext(spec_path)[0]
+    if root.endswith('_spec'):
+        root = root[:-len('_spec')]
+    return root + '.attheme'
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog='build.py watch')
+    parser.add_argument('-s', '--spec', default=os.path.join(os.path.dirname(__file__), 'build.py'),
+                        help='file holding the PALETTE and KEYS blocks')
+    parser.add_argument('-o', '--output', help='defaults to true_black.attheme or <spec>.attheme')
+    parser.add_argument('--sync', metavar='DIR', help='also copy every rebuild into DIR')
+    parser.add_argument('--poll', action='store_true', help='poll instead of using inotify')
+    args = parser.parse_args(argv)
+    out = args.output or default_output(args.spec)
+
+    theme = live_theme()
+    rebuild(theme, args.spec, out, args.sync, first=True)
+    watcher = make_watcher(args.spec, args.poll)
+    print(f'watching {args.spec} ({type(watcher).__name__})')
+    try:
+        while True:
+            watcher.wait()
+            while watcher.wait(DEBOUNCE):
+                pass
+            rebuild(theme, args.spec, out, args.sync)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])